@@ -32,6 +32,9 @@ For more information on the configuration and usage of ASHA, see
 https://orion.readthedocs.io/en/develop/user/algorithms.html#asha
 """
 
+# Marks entries of the rungs which did not exist before an observation
+_MISSING = object()
+
 
 class ASHA(BaseAlgorithm):
     """Asynchronous Successive Halving Algorithm
@@ -81,6 +84,7 @@ class ASHA(BaseAlgorithm):
             reduction_factor=reduction_factor, num_rungs=num_rungs, num_brackets=num_brackets)
 
         self.trial_info = {}  # Stores Trial -> Bracket
+        self._undo_log = None
 
         try:
             fidelity_index = self.fidelity_index
@@ -153,6 +157,34 @@ class ASHA(BaseAlgorithm):
         self.seed_rng(0)
         self.rng.set_state(state_dict['rng_state'])
 
+    def snapshot(self):
+        """Start recording observations so that they can be discarded with `rollback`.
+
+        Rather than copying the rungs, the entries overwritten by `observe` are recorded in an
+        undo log and the snapshot is the position in this log.
+        """
+        if self._undo_log is None:
+            self._undo_log = []
+
+        return len(self._undo_log)
+
+    def rollback(self, snapshot):
+        """Discard all observations made since the given snapshot was taken."""
+        while len(self._undo_log) > snapshot:
+            mapping, key, value = self._undo_log.pop()
+            if value is _MISSING:
+                del mapping[key]
+            else:
+                mapping[key] = value
+
+        if snapshot == 0:
+            self._undo_log = None
+
+    def _record(self, mapping, key):
+        """Record the value of `mapping[key]` before it gets overwritten by an observation"""
+        if self._undo_log is not None:
+            self._undo_log.append((mapping, key, mapping.get(key, _MISSING)))
+
     def suggest(self, num=1):
         """Suggest a `num` of new sets of parameters.
 
@@ -238,6 +270,7 @@ class ASHA(BaseAlgorithm):
                 continue
 
             if _id not in self.trial_info:
+                self._record(self.trial_info, _id)
                 self.trial_info[_id] = bracket
 
     @property
@@ -288,7 +321,9 @@ class Bracket():
             raise IndexError(REGISTRATION_ERROR.format(fidelity=fidelity, budgets=budgets,
                                                        params=point))
 
-        rungs[0][self.asha.get_id(point)] = (objective, point)
+        point_id = self.asha.get_id(point)
+        self.asha._record(rungs[0], point_id)  # pylint: disable=protected-access
+        rungs[0][point_id] = (objective, point)
 
     def get_candidate(self, rung_id):
         """Get a candidate for promotion"""
@@ -10,6 +10,7 @@
 
 """
 from abc import (ABCMeta, abstractmethod)
+import copy
 import logging
 
 from orion.core.utils import Factory
@@ -139,6 +140,29 @@ class BaseAlgorithm(object, metaclass=ABCMeta):
         """
         pass
 
+    def snapshot(self):
+        """Return a snapshot of the observations of the algorithm, to be restored with `rollback`.
+
+        This is used to observe temporary results, such as the lies of a parallel strategy, and
+        discard them afterwards without copying the whole algorithm.
+
+        The default implementation makes a deep copy of the attributes of the algorithm.
+        Algorithms with large observation sets should rather override `snapshot` and `rollback`
+        to only keep track of the changes made by `observe`.
+
+        .. note:: A snapshot can only be restored once. The state of the algorithm returned by
+           `state_dict` may not be preserved by `rollback`.
+        """
+        return copy.deepcopy(self.__dict__)
+
+    def rollback(self, snapshot):
+        """Discard all observations made since the given snapshot was taken.
+
+        :param snapshot: Object returned by `snapshot`.
+        """
+        self.__dict__.clear()
+        self.__dict__.update(snapshot)
+
     @abstractmethod
     def suggest(self, num=1):
         """Suggest a `num` of new sets of parameters.
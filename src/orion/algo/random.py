@@ -45,6 +45,14 @@ class Random(BaseAlgorithm):
         self.seed_rng(0)
         self.rng.set_state(state_dict['rng_state'])
 
+    def snapshot(self):
+        """Return a snapshot of the observations, which are all ignored by random search."""
+        return None
+
+    def rollback(self, snapshot):
+        """Discard observations made since the snapshot, which are all ignored anyway."""
+        pass
+
     def suggest(self, num=1):
         """Suggest a `num` of new sets of parameters. Randomly draw samples
         from the import space and return them.
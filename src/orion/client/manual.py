@@ -9,6 +9,7 @@
       and link them with a particular existing experiment.
 
 """
+from orion.core.io.database import DuplicateKeyError
 from orion.core.io.experiment_builder import ExperimentBuilder
 from orion.core.utils import format_trials
 
@@ -26,6 +27,9 @@ def insert_trials(experiment_name, points, cmdconfig=None, raise_exc=True):
     .. note:: If `raise_exc` is True, no set of parameters will be inserted. If
        it is False, only the valid ones will be inserted; the rest will be ignored.
 
+    .. note:: Sets of parameters already present in the experiment are not inserted again.
+       If `raise_exc` is True, a `DuplicateKeyError` is raised after the others are inserted.
+
     .. note:: This cannot be used to prepopulate a future experiment. So,
        an experiment with `experiment_name` should already be configured in
        the database.
@@ -55,5 +59,9 @@ def insert_trials(experiment_name, points, cmdconfig=None, raise_exc=True):
         map(lambda data: format_trials.tuple_to_trial(data, experiment_view.space),
             valid_points))
 
-    for new_trial in new_trials:
-        ExperimentBuilder().build_from(experiment_view.configuration).register_trial(new_trial)
+    experiment = ExperimentBuilder().build_from(experiment_view.configuration)
+    duplicates = experiment.register_trials(new_trials)
+    if duplicates and raise_exc:
+        raise DuplicateKeyError(
+            "Trials already exist in the database: {}".format(
+                ", ".join(trial.id for trial in duplicates)))
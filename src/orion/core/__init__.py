@@ -77,6 +77,14 @@ def define_database_config(config):
         'host', option_type=str, default=default_host, env_var='ORION_DB_ADDRESS')
     database_config.add_option(
         'port', option_type=int, default=27017, env_var='ORION_DB_PORT')
+    database_config.add_option(
+        'max_pool_size', option_type=int, default=None, env_var='ORION_DB_MAX_POOL_SIZE')
+    database_config.add_option(
+        'write_concern', option_type=str, default=None, env_var='ORION_DB_WRITE_CONCERN')
+    database_config.add_option(
+        'read_preference', option_type=str, default=None, env_var='ORION_DB_READ_PREFERENCE')
+    database_config.add_option(
+        'batch_size', option_type=int, default=0, env_var='ORION_DB_BATCH_SIZE')
 
     config.database = database_config
 
@@ -91,6 +99,12 @@ def define_worker_config(config):
         'max_broken', option_type=int, default=3)
     worker_config.add_option(
         'max_idle_time', option_type=int, default=60)
+    worker_config.add_option(
+        'max_reservation_wait', option_type=int, default=60)
+    worker_config.add_option(
+        'completion_margin', option_type=int, default=60)
+    worker_config.add_option(
+        'resync_interval', option_type=int, default=600)
 
     config.worker = worker_config
 
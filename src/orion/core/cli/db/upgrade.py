@@ -170,6 +170,9 @@ def upgrade_pickledb(database):
         else:
             self._indexes = state['_indexes']
 
+        self._restore_query_indexes()
+        self._restore_next_id()
+
     old_setstate = getattr(EphemeralCollection, '__setstate__', None)
     EphemeralCollection.__setstate__ = upgrade_state
 
@@ -42,6 +42,12 @@ def add_subparser(parser):
              "did not reach its maximum number of trials "
              "(default: %s)" % resolve_config.DEF_CMD_WORKER_TRIALS[1])
 
+    orion_group.add_argument(
+        '--n-workers', type=int, metavar='#',
+        help="number of trials to be executed concurrently by this worker. Trials are "
+             "reserved and produced for all of them by a single process "
+             "(default: %s)" % resolve_config.DEF_CMD_N_WORKERS[1])
+
     orion_group.add_argument('--working-dir', type=str,
                              help="Set working directory for running experiment.")
 
@@ -70,6 +76,6 @@ def main(args):
     args['root'] = None
     args['leafs'] = []
     # TODO: simplify when parameter parsing is refactored
-    worker_trials = ExperimentBuilder().fetch_full_config(args)['worker_trials']
+    config = ExperimentBuilder().fetch_full_config(args)
     experiment = EVCBuilder().build_from(args)
-    workon(experiment, worker_trials)
+    workon(experiment, config['worker_trials'], config['n_workers'])
@@ -420,20 +420,9 @@ def format_stats(experiment):
         return NO_STATS_TEMPLATE.format(
             title=format_title("Stats"))
 
-    best_params = get_trial_params(stats['best_trials_id'], experiment)
-
     stats_string = STATS_TEMPLATE.format(
         title=format_title("Stats"),
         stats=stats,
-        best_params=format_dict(best_params, depth=2, width=2))
+        best_params=format_dict(stats['best_params'], depth=2, width=2))
 
     return stats_string
-
-
-def get_trial_params(trial_id, experiment):
-    """Get params from trial_id in given experiment"""
-    best_trial = experiment.get_trial(uid=trial_id)
-    if not best_trial:
-        return {}
-
-    return dict((param.name, param.value) for param in best_trial.params)
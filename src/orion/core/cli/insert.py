@@ -17,6 +17,7 @@ import re
 
 from orion.core.cli import base as cli
 from orion.core.io.convert import infer_converter_from_file_type
+from orion.core.io.database import DuplicateKeyError
 from orion.core.io.experiment_builder import ExperimentBuilder
 from orion.core.utils.format_trials import tuple_to_trial
 
@@ -51,7 +52,8 @@ def main(args):
 
     trial = tuple_to_trial(values, exp_space)
 
-    experiment.register_trial(trial)
+    if experiment.register_trials([trial]):
+        raise DuplicateKeyError("Trial {} already exists in the database".format(trial.id))
 
 
 def _validate_dimensions(transformed_args, exp_space):
@@ -150,7 +150,7 @@ def print_status(exp, offset=0, all_trials=False, collapse=False):
         Fetch trials for entire EVCTree. Defaults to False.
 
     """
-    trials = exp.fetch_trials(with_evc_tree=collapse)
+    trials = exp.fetch_trials(with_evc_tree=collapse, selection={'status': 1, 'results': 1})
 
     exp_title = exp.node.tree_name
     print(" " * offset, exp_title, sep="")
@@ -123,6 +123,10 @@ class Configuration:
             raise ConfigurationError("Configuration not set and no default "
                                      "provided: {}.".format(key))
 
+        # A default of None means the option is not set
+        if value is None:
+            return None
+
         return config_setting['type'](value)
 
     def __setattr__(self, key, value):
@@ -174,6 +178,9 @@ class Configuration:
         if isinstance(value, Configuration):
             raise TypeError("Cannot overwrite option {} with a configuration".format(key))
 
+        if value is None:
+            return
+
         try:
             self._config[key]['type'](value)
         except ValueError as e:
@@ -175,6 +175,34 @@ class AbstractDB(object, metaclass=AbstractSingletonType):
         """
         pass
 
+    @abstractmethod
+    def insert_many(self, collection_name, documents):
+        """Insert new documents in a collection, skipping duplicates.
+
+        Contrarily to `write()`, the insertion is not aborted at the first document creating
+        duplicate keys. All other documents are inserted.
+
+        Parameters
+        ----------
+        collection_name : str
+           A collection inside database, a table.
+        documents : list of dicts
+           New data that will **be inserted**.
+
+        Returns
+        -------
+        list of int
+            Positions in `documents` of the documents which were not inserted because they would
+            create duplicate keys. Only occurs if the keys have unique indexes. See
+            :meth:`AbstractDB.ensure_index` for more information about indexes.
+
+        Notes
+        -----
+        Inserted documents will be updated to contain a unique *_id* key.
+
+        """
+        pass
+
     @abstractmethod
     def read(self, collection_name, query=None, selection=None):
         """Read a collection and return a value according to the query.
@@ -196,6 +224,17 @@ class AbstractDB(object, metaclass=AbstractSingletonType):
         """
         pass
 
+    def read_iter(self, collection_name, query=None, selection=None):
+        """Iterate over the documents of a collection matching the query.
+
+        Backends able to fetch documents lazily override this method to avoid holding all the
+        matched documents in memory at once.
+
+        .. seealso:: :meth:`AbstractDB.read` for argument documentation.
+
+        """
+        return iter(self.read(collection_name, query=query, selection=selection))
+
     @abstractmethod
     def read_and_write(self, collection_name, query, data, selection=None):
         """Read a collection's document and update the found document.
@@ -244,6 +283,27 @@ class AbstractDB(object, metaclass=AbstractSingletonType):
         """
         pass
 
+    @abstractmethod
+    def aggregate(self, collection_name, pipeline):
+        """Process the documents of a collection through an aggregation pipeline.
+
+        Parameters
+        ----------
+        collection_name : str
+           A collection inside database, a table.
+        pipeline : list of dicts
+           Stages of the aggregation, following MongoDB syntax. Only the `$match`, `$unwind` and
+           `$group` stages are guaranteed to be supported, with the `$sum`, `$min` and `$max`
+           accumulators.
+
+        Returns
+        -------
+        list of dicts
+            Documents produced by the last stage of the pipeline.
+
+        """
+        pass
+
     @abstractmethod
     def remove(self, collection_name, query):
         """Delete from a collection document[s] which match the `query`.
@@ -275,7 +335,7 @@ class ReadOnlyDB(object):
                         # Properties
                         ["is_connected"] +
                         # Methods
-                        ["initiate_connection", "close_connection", "read", "count"])
+                        ["initiate_connection", "close_connection", "read", "read_iter", "count"])
 
     def __init__(self, database):
         """Init method, see attributes of :class:`AbstractDB`."""
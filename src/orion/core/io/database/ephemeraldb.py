@@ -8,6 +8,7 @@
    :synopsis: Implement non permanent version of :class:`orion.core.io.database.AbstractDB`
 
 """
+import bisect
 from collections import defaultdict
 import copy
 
@@ -26,6 +27,89 @@ def _convert_keys_to_name(keys):
     return index
 
 
+def _comparable(value):
+    """Convert documents and arrays to tuples to hash and compare them like MongoDB does"""
+    if isinstance(value, dict):
+        return tuple(_comparable(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return tuple(_comparable(item) for item in value)
+
+    return value
+
+
+def _sum(accumulated, value):
+    """Add the value to the sum if it is numerical"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return accumulated + value
+
+    return accumulated
+
+
+def _min(accumulated, value):
+    """Keep the smallest value, ignoring missing ones"""
+    if value is None or (accumulated is not None and
+                         _comparable(accumulated) <= _comparable(value)):
+        return accumulated
+
+    return value
+
+
+def _max(accumulated, value):
+    """Keep the largest value, ignoring missing ones"""
+    if value is None or (accumulated is not None and
+                         _comparable(accumulated) >= _comparable(value)):
+        return accumulated
+
+    return value
+
+
+ACCUMULATORS = {
+    "$sum": (0, _sum),
+    "$min": (None, _min),
+    "$max": (None, _max),
+}
+
+
+def _match_stage(documents, query):
+    return (document for document in documents if document.match(query))
+
+
+def _unwind_stage(documents, path):
+    return (unwound for document in documents for unwound in document.unwind(path.lstrip('$')))
+
+
+def _group_stage(documents, specification):
+    """Group documents by the `_id` expression and accumulate values of each group"""
+    specification = dict(specification)
+    key_expression = specification.pop('_id')
+
+    accumulators = dict()
+    for name, accumulator in specification.items():
+        (operator, expression), = accumulator.items()
+        if operator not in ACCUMULATORS:
+            raise ValueError('Accumulator \'{}\' is not supported by EphemeralDB'.format(operator))
+        accumulators[name] = (ACCUMULATORS[operator], expression)
+
+    groups = dict()
+    for document in documents:
+        key = document.evaluate(key_expression)
+        group = groups.setdefault(
+            _comparable(key),
+            dict(_id=key, **{name: initial for name, ((initial, _), _) in accumulators.items()}))
+
+        for name, ((_, accumulate), expression) in accumulators.items():
+            group[name] = accumulate(group[name], document.evaluate(expression))
+
+    return (EphemeralDocument(group) for group in groups.values())
+
+
+STAGES = {
+    "$match": _match_stage,
+    "$unwind": _unwind_stage,
+    "$group": _group_stage,
+}
+
+
 # pylint: disable=too-many-public-methods
 class EphemeralDB(AbstractDB):
     """Non permanent database
@@ -53,7 +137,7 @@ class EphemeralDB(AbstractDB):
     def ensure_index(self, collection_name, keys, unique=False):
         """Create given indexes if they do not already exist in database.
 
-        Indexes are only created if `unique` is True.
+        Only unique indexes are enforced, all indexes are used to speed up queries.
         """
         self._db[collection_name].create_index(keys, unique=unique)
 
@@ -85,6 +169,23 @@ class EphemeralDB(AbstractDB):
         return dbcollection.update_many(query=query,
                                         update=update_data)
 
+    def insert_many(self, collection_name, documents):
+        """Insert new documents in a collection, skipping duplicates.
+
+        .. seealso:: :meth:`AbstractDB.insert_many` for argument documentation.
+
+        """
+        dbcollection = self._db[collection_name]
+
+        duplicates = []
+        for position, document in enumerate(documents):
+            try:
+                dbcollection.insert_many(documents=[document])
+            except DuplicateKeyError:
+                duplicates.append(position)
+
+        return duplicates
+
     def read(self, collection_name, query=None, selection=None):
         """Read a collection and return a value according to the query.
 
@@ -106,11 +207,11 @@ class EphemeralDB(AbstractDB):
                      argument documentation.
 
         """
-        dbdoc = self.read(collection_name, query)
-        if not dbdoc:
+        dbdoc = self._db[collection_name].find_one(query, {'_id': 1})
+        if dbdoc is None:
             return None
 
-        id_query = {'_id': dbdoc[0]['_id']}
+        id_query = {'_id': dbdoc['_id']}
         self.write(collection_name, data, id_query)
         return self.read(collection_name, id_query)[0]
 
@@ -123,6 +224,15 @@ class EphemeralDB(AbstractDB):
         dbcollection = self._db[collection_name]
         return dbcollection.count(query=query)
 
+    def aggregate(self, collection_name, pipeline):
+        """Process the documents of a collection through an aggregation pipeline.
+
+        .. seealso:: :meth:`AbstractDB.aggregate` for argument documentation.
+
+        """
+        dbcollection = self._db[collection_name]
+        return dbcollection.aggregate(pipeline)
+
     def remove(self, collection_name, query):
         """Delete from a collection document[s] which match the `query`.
 
@@ -147,12 +257,53 @@ class EphemeralCollection(object):
         """Initialise the collection, with no documents and only _id unique index."""
         self._documents = []
         self._indexes = dict()
+        self._query_indexes = dict()
+        self._next_rank = 0
+        self._next_id = 1
         self.create_index('_id', unique=True)
 
+    def __setstate__(self, state):
+        """Set state, building query indexes missing in collections pickled by older versions"""
+        self.__dict__.update(state)
+        if '_query_indexes' not in state:
+            self._restore_query_indexes()
+        if '_next_id' not in state:
+            self._restore_next_id()
+
+    def _restore_query_indexes(self):
+        """Rank documents and build query indexes based on the unique indexes"""
+        for rank, document in enumerate(self._documents):
+            document.rank = rank
+        self._next_rank = len(self._documents)
+
+        self._query_indexes = dict()
+        for name, (keys, _) in self._indexes.items():
+            self._query_indexes[name] = self._build_query_index(keys)
+
+    def _restore_next_id(self):
+        """Set the id counter after the largest integer id of the documents"""
+        self._next_id = 1
+        for document in self._documents:
+            self._update_next_id(document['_id'])
+
+    def _update_next_id(self, uid):
+        """Make sure the id counter never assigns an id already given explicitly"""
+        if isinstance(uid, int) and uid >= self._next_id:
+            self._next_id = uid + 1
+
+    def _build_query_index(self, keys):
+        """Create a query index over all documents of the collection"""
+        index = EphemeralIndex(keys)
+        for document in self._documents:
+            index.add(document)
+
+        return index
+
     def create_index(self, keys, unique=False):
         """Create given indexes if they do not already exist for this collection.
 
-        Indexes are only created if `unique` is True.
+        All indexes are used to speed up queries. Only unique indexes are enforced
+        when inserting documents.
         """
         # turn single key into list for coherence
         if not isinstance(keys, (list, tuple)):
@@ -169,40 +320,87 @@ class EphemeralCollection(object):
                 self._validate_index(document, indexes=[name])
                 data.add(tuple(document[key] for key in keys))
 
+        if name not in self._query_indexes:
+            self._query_indexes[name] = self._build_query_index(keys)
+
     def index_information(self):
         """Return dict of names and sorting order of indexes
 
-        EphemeralCollection may only contain unique indexes.
+        Each value represents whether the index is unique.
         """
-        return {name: True for name in self._indexes}
+        return {name: name in self._indexes for name in self._query_indexes}
 
     def drop_index(self, name):
-        """Remove index from the database
-
-        EphemeralCollection may only contain unique indexes.
-        """
-        if name not in self._indexes:
+        """Remove index from the database"""
+        if name not in self._query_indexes and name not in self._indexes:
             raise DatabaseError('index not found with name {}'.format(name))
 
-        del self._indexes[name]
+        self._query_indexes.pop(name, None)
+        self._indexes.pop(name, None)
 
     def _register_keys(self, document):
         """Register index values of a new document"""
         for keys, values in self._indexes.values():
             values.add(tuple(document[key] for key in keys))
 
+        for index in self._query_indexes.values():
+            index.add(document)
+
+    def _get_candidates(self, query):
+        """Return the documents that may match the query, in order of insertion
+
+        Query indexes covering the query are intersected to select the candidates. All documents
+        are returned if no index can be used.
+        """
+        candidates = self._lookup_candidates(query)
+        if candidates is None:
+            return self._documents
+
+        return sorted(candidates, key=lambda document: document.rank)
+
+    def _lookup_candidates(self, query):
+        """Return the unordered set of documents that may match the query
+
+        Returns None if no index can be used.
+        """
+        if not query:
+            return None
+
+        query = flatten(query)
+        subsets = []
+        for index in self._query_indexes.values():
+            subset = index.lookup(query)
+            if subset is not None:
+                subsets.append(subset)
+
+        if not subsets:
+            return None
+
+        return _intersect(subsets)
+
+    def _match(self, query):
+        """Return the documents matching the query, in order of insertion"""
+        return [document for document in self._get_candidates(query) if document.match(query)]
+
     def find(self, query=None, selection=None):
         """Find documents in the collection and return a value according to the query.
 
         .. seealso:: :meth:`AbstractDB.read` for argument documentation.
 
         """
-        found_documents = []
-        for document in self._documents:
+        return [document.select(selection) for document in self._match(query)]
+
+    def find_one(self, query=None, selection=None):
+        """Find the first document matching the query, or None if nothing found.
+
+        .. seealso:: :meth:`AbstractDB.read` for argument documentation.
+
+        """
+        for document in self._get_candidates(query):
             if document.match(query):
-                found_documents.append(document.select(selection))
+                return document.select(selection)
 
-        return found_documents
+        return None
 
     def _validate_index(self, document, indexes=None):
         """Validate index values of a document
@@ -224,17 +422,17 @@ class EphemeralCollection(object):
                     "Duplicate key error: index={} value={}".format(name, document_values))
 
     def _get_new_id(self):
-        """Return max id + 1"""
-        if self._documents:
-            return max(d['_id'] for d in self._documents) + 1
+        """Return the next id of the collection counter
 
-        return 1
+        The counter is kept with the collection, ids of deleted documents are never reused.
+        """
+        return self._next_id
 
     def insert_many(self, documents):
         """Add new documents in the collection.
 
         If the documents do not have a keys `_id`, they are assigned by default
-        the max id + 1.
+        the next id of the collection counter, which is always above the max integer id.
 
         Raises
         ------
@@ -245,10 +443,12 @@ class EphemeralCollection(object):
         for document in documents:
             if '_id' not in document:
                 document['_id'] = self._get_new_id()
-            ephemeral_document = EphemeralDocument(document)
+            ephemeral_document = EphemeralDocument(document, rank=self._next_rank)
             self._validate_index(ephemeral_document)
             self._documents.append(ephemeral_document)
             self._register_keys(ephemeral_document)
+            self._update_next_id(document['_id'])
+            self._next_rank += 1
 
         return len(documents)
 
@@ -261,13 +461,17 @@ class EphemeralCollection(object):
             If the update creates a duplication of unique indexes in the database.
 
         """
-        updates = 0
-        for document in self._documents:
-            if document.match(query):
-                document.update(update)
-                updates += 1
+        documents = self._match(query)
+        for document in documents:
+            for index in self._query_indexes.values():
+                index.remove(document)
 
-        return updates
+            document.update(update)
+
+            for index in self._query_indexes.values():
+                index.add(document)
+
+        return len(documents)
 
     def _upsert(self, query, update):
         """Insert the document when query was not found.
@@ -289,7 +493,38 @@ class EphemeralCollection(object):
         .. seealso:: :meth:`AbstractDB.count` for argument documentation.
 
         """
-        return len(self.find(query))
+        if not query:
+            return len(self._documents)
+
+        candidates = self._lookup_candidates(query)
+        if candidates is None:
+            candidates = self._documents
+
+        return sum(1 for document in candidates if document.match(query))
+
+    def aggregate(self, pipeline):
+        """Process the documents through an aggregation pipeline.
+
+        Documents are streamed through the stages so that only the groups are held in memory. A
+        `$match` stage at the beginning of the pipeline is resolved using the query indexes.
+
+        .. seealso:: :meth:`AbstractDB.aggregate` for argument documentation.
+
+        """
+        stages = list(pipeline)
+        if stages and '$match' in stages[0]:
+            query = stages.pop(0)['$match']
+            documents = _match_stage(self._get_candidates(query), query)
+        else:
+            documents = iter(self._documents)
+
+        for stage in stages:
+            (operator, argument), = stage.items()
+            if operator not in STAGES:
+                raise ValueError('Stage \'{}\' is not supported by EphemeralDB'.format(operator))
+            documents = STAGES[operator](documents, argument)
+
+        return [document.to_dict() for document in documents]
 
     def delete_many(self, query=None):
         """Delete from a collection document[s] which match the `query`.
@@ -297,25 +532,190 @@ class EphemeralCollection(object):
         .. seealso:: :meth:`AbstractDB.remove` for argument documentation.
 
         """
-        deleted = 0
-        retained_documents = []
-        for document in self._documents:
-            if not document.match(query):
-                retained_documents.append(document)
-            else:
-                deleted += 1
+        deleted_documents = set(self._match(query))
+        if not deleted_documents:
+            return 0
+
+        for document in deleted_documents:
+            for index in self._query_indexes.values():
+                index.remove(document)
 
-        self._documents = retained_documents
+        self._documents = [document for document in self._documents
+                           if document not in deleted_documents]
 
-        return deleted
+        return len(deleted_documents)
 
     def drop(self):
         """Drop the collection, removing all documents and indexes."""
         self._documents = []
         self._indexes = dict()
+        self._query_indexes = dict()
+        self._next_rank = 0
+        self._next_id = 1
         self.create_index('_id', unique=True)
 
 
+class EphemeralIndex(object):
+    """Non permanent query index
+
+    Documents are grouped in buckets by the values of the indexed keys to resolve equality and
+    `$in` queries. For single key indexes, the distinct values are also kept sorted to resolve
+    range queries (`$gt`, `$gte`, `$lte`). Documents with unhashable values cannot be indexed and
+    are always returned as candidates.
+
+    .. seealso:: :class:`orion.core.io.database.ephemeraldb.EphemeralCollection` for collection
+        object.
+
+    """
+
+    def __init__(self, keys):
+        """Initialise the index with no documents"""
+        self.keys = keys
+        self._buckets = dict()
+        self._sorted_values = []
+        self._sortable = len(keys) == 1
+        self._unhashable = set()
+
+    def _get_value(self, document):
+        """Return the value of the indexed keys in the document"""
+        if len(self.keys) == 1:
+            return document[self.keys[0]]
+
+        return tuple(document[key] for key in self.keys)
+
+    def add(self, document):
+        """Register a document in the index"""
+        value = self._get_value(document)
+        try:
+            bucket = self._buckets.get(value)
+        except TypeError:
+            self._unhashable.add(document)
+            return
+
+        if bucket is None:
+            bucket = self._buckets[value] = set()
+            self._add_sorted_value(value)
+
+        bucket.add(document)
+
+    def remove(self, document):
+        """Remove a document from the index"""
+        value = self._get_value(document)
+        try:
+            bucket = self._buckets.get(value)
+        except TypeError:
+            self._unhashable.discard(document)
+            return
+
+        if bucket is None:
+            return
+
+        bucket.discard(document)
+        if not bucket:
+            del self._buckets[value]
+            self._remove_sorted_value(value)
+
+    def _add_sorted_value(self, value):
+        """Insert a new distinct value in the sorted values"""
+        if not self._sortable or value is None:
+            return
+
+        try:
+            bisect.insort(self._sorted_values, value)
+        except TypeError:
+            # Values of different types cannot be sorted, range queries will not use this index.
+            self._sortable = False
+            self._sorted_values = []
+
+    def _remove_sorted_value(self, value):
+        """Remove a distinct value from the sorted values"""
+        if not self._sortable or value is None:
+            return
+
+        position = bisect.bisect_left(self._sorted_values, value)
+        if position < len(self._sorted_values) and self._sorted_values[position] == value:
+            del self._sorted_values[position]
+
+    def _get_bucket(self, value):
+        """Return the documents with the given value"""
+        return self._buckets.get(value, set())
+
+    def _get_range(self, operator, value):
+        """Return the documents with a value in the range defined by the operator"""
+        if operator == '$gte':
+            values = self._sorted_values[bisect.bisect_left(self._sorted_values, value):]
+        elif operator == '$gt':
+            values = self._sorted_values[bisect.bisect_right(self._sorted_values, value):]
+        else:
+            values = self._sorted_values[:bisect.bisect_right(self._sorted_values, value)]
+
+        documents = set()
+        for sorted_value in values:
+            documents |= self._buckets[sorted_value]
+
+        return documents
+
+    def lookup(self, query):
+        """Return a superset of the documents matching the flattened query
+
+        Returns None if the index cannot be used for this query.
+        """
+        try:
+            if len(self.keys) > 1:
+                if not all(key in query for key in self.keys):
+                    return None
+                documents = self._get_bucket(tuple(query[key] for key in self.keys))
+            else:
+                documents = self._lookup_key(query)
+        except TypeError:
+            # Unhashable or unsortable values in the query
+            return None
+
+        if documents is None or not self._unhashable:
+            return documents
+
+        return documents | self._unhashable
+
+    def _lookup_key(self, query):
+        """Return the intersection of documents matching the query on the single indexed key"""
+        key = self.keys[0]
+        subsets = []
+        if key in query:
+            subsets.append(self._get_bucket(query[key]))
+
+        if key + '.$in' in query:
+            documents = set()
+            for value in query[key + '.$in']:
+                documents |= self._get_bucket(value)
+            subsets.append(documents)
+
+        if self._sortable:
+            for operator in ('$gte', '$gt', '$lte'):
+                if key + '.' + operator in query:
+                    subsets.append(self._get_range(operator, query[key + '.' + operator]))
+
+        if not subsets:
+            return None
+
+        return _intersect(subsets)
+
+
+def _intersect(subsets):
+    """Return the intersection of sets of documents
+
+    The sets may be the buckets of the indexes themselves and are never modified. When there are
+    many, the smallest one is iterated over and the others are only tested for membership, so that
+    the cost is proportional to the size of the smallest set rather than the biggest one.
+    """
+    if len(subsets) == 1:
+        return subsets[0]
+
+    smallest = min(subsets, key=len)
+    others = [subset for subset in subsets if subset is not smallest]
+    return set(document for document in smallest
+               if all(document in subset for subset in others))
+
+
 class EphemeralDocument(object):
     """Non permanent document
 
@@ -333,9 +733,13 @@ class EphemeralDocument(object):
         "$lte": (lambda a, b: a is not None and a <= b),
     }
 
-    def __init__(self, data):
-        """Initialise the document with a flattened version of the data"""
+    def __init__(self, data, rank=0):
+        """Initialise the document with a flattened version of the data
+
+        The rank is the order of insertion of the document in its collection.
+        """
         self._data = flatten(data)
+        self.rank = rank
 
     def match(self, query=None):
         """Test if the document corresponds to a given query"""
@@ -467,6 +871,53 @@ class EphemeralDocument(object):
         data = flatten(data.get("$set", data))
         self._data.update(data)
 
+    def get(self, key):
+        """Get the value at the given key, which may be a sub-document"""
+        if key in self._data:
+            return self._data[key]
+
+        prefix = key + '.'
+        sub_document = dict((sub_key[len(prefix):], value) for sub_key, value in self._data.items()
+                            if sub_key.startswith(prefix))
+        if not sub_document:
+            return None
+
+        return unflatten(sub_document)
+
+    def evaluate(self, expression):
+        """Evaluate an aggregation expression on the document
+
+        Strings starting with `$` are paths of fields of the document, dictionaries are evaluated
+        recursively and other values are constants.
+        """
+        if isinstance(expression, str) and expression.startswith('$'):
+            return self.get(expression[1:])
+
+        if isinstance(expression, dict):
+            return dict((key, self.evaluate(value)) for key, value in expression.items())
+
+        return expression
+
+    def unwind(self, key):
+        """Yield a copy of the document for each element of the array at the given key
+
+        Documents where the key is missing or the array is empty are dropped.
+        """
+        values = self.get(key)
+        if values is None:
+            return
+
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+
+        data = dict((data_key, value) for data_key, value in self._data.items()
+                    if data_key != key and not data_key.startswith(key + '.'))
+        for value in values:
+            document = copy.copy(self)
+            document._data = dict(data)  # pylint: disable=protected-access
+            document._data.update(flatten({key: value}))  # pylint: disable=protected-access
+            yield document
+
     def to_dict(self):
         """Convert the ephemeral document to a python dictionary"""
         return self.select({})
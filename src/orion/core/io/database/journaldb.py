@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+:mod:`orion.core.io.database.journaldb` -- Journaled Database
+=============================================================
+
+.. module:: database
+   :platform: Unix
+   :synopsis: Implement permanent version of :class:`orion.core.io.database.EphemeralDB`
+              backed by an append-only journal
+
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+import logging
+import os
+import pickle
+from pickle import PicklingError
+import struct
+import threading
+
+from filelock import FileLock
+
+import orion.core
+from orion.core.io.database import DuplicateKeyError
+from orion.core.io.database.ephemeraldb import EphemeralCollection, EphemeralDB
+from orion.core.io.database.pickleddb import find_unpickable_field
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HOST = os.path.join(orion.core.DIRS.user_data_dir, 'orion', 'orion_db.journal')
+
+DEFAULT_COMPACTION_THRESHOLD = 1000
+
+RECORD_HEADER = struct.Struct('<Q')
+
+
+def _frame(record):
+    """Serialize a journal record prefixed with its length"""
+    payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+    return RECORD_HEADER.pack(len(payload)) + payload
+
+
+def _iter_records(journal):
+    """Iterate over the complete records of a journal file
+
+    Yields pairs of (record, offset at the end of the record). Iteration stops at the first
+    incomplete record, which may be in the process of being appended by another worker.
+    """
+    while True:
+        header = journal.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return
+
+        size, = RECORD_HEADER.unpack(header)
+        payload = journal.read(size)
+        if len(payload) < size:
+            return
+
+        yield pickle.loads(payload), journal.tell()
+
+
+# pylint: disable=too-many-public-methods,too-many-instance-attributes
+class JournalDB(EphemeralDB):
+    """EphemeralDB kept in sync with an append-only journal to support permanancy and concurrency
+
+    Each write operation is appended as a record at the end of a journal file. Every worker keeps
+    an in-memory copy of the database and only replays the records appended since its last
+    operation. Writes are protected with a filelock while reads only need to replay the tail of the
+    journal. When the journal contains more than `compaction_threshold` records, it is compacted in
+    a background thread by replacing it with a single snapshot of the database.
+
+    Parameters
+    ----------
+    host: str
+        File path of the journal.  Default is {user data dir}/orion/orion_db.journal ex:
+        $HOME/.local/share/orion/orion_db.journal
+    compaction_threshold: int
+        Number of records in the journal triggering a compaction. Default is 1000.
+
+    """
+
+    # pylint: disable=unused-argument
+    def __init__(self, host=DEFAULT_HOST, *args,
+                 compaction_threshold=DEFAULT_COMPACTION_THRESHOLD, **kwargs):
+        self.compaction_threshold = compaction_threshold
+        self._state_lock = threading.RLock()
+        self._compaction = None
+        self._journal_id = None
+        self._offset = 0
+        self._n_records = 0
+
+        if os.path.dirname(host):
+            os.makedirs(os.path.dirname(host), exist_ok=True)
+
+        super(JournalDB, self).__init__(host)
+        self._file_lock = FileLock(self.host + '.lock')
+
+    def initiate_connection(self):
+        """Create the in-memory database, filled lazily from the journal"""
+        with self._state_lock:
+            super(JournalDB, self).initiate_connection()
+            self._journal_id = None
+            self._offset = 0
+            self._n_records = 0
+
+    def close_connection(self):
+        """Wait for background compaction and remove the in-memory database"""
+        if self._compaction is not None:
+            self._compaction.join()
+
+        with self._state_lock:
+            super(JournalDB, self).close_connection()
+
+    def ensure_index(self, collection_name, keys, unique=False):
+        """Create given indexes if they do not already exist in database.
+
+        Only unique indexes are enforced, all indexes are used to speed up queries.
+        """
+        with self._locked_journal() as records:
+            super(JournalDB, self).ensure_index(collection_name, keys, unique=unique)
+            records.append(('ensure_index', (collection_name, keys, unique)))
+
+    def index_information(self, collection_name):
+        """Return dict of names and sorting order of indexes"""
+        with self._synced_database():
+            return super(JournalDB, self).index_information(collection_name)
+
+    def drop_index(self, collection_name, name):
+        """Remove index from the database"""
+        with self._locked_journal() as records:
+            super(JournalDB, self).drop_index(collection_name, name)
+            records.append(('drop_index', (collection_name, name)))
+
+    def write(self, collection_name, data, query=None):
+        """Write new information to a collection. Perform insert or update.
+
+        .. seealso:: :meth:`AbstractDB.write` for argument documentation.
+
+        """
+        with self._locked_journal() as records:
+            if query is not None:
+                rval = super(JournalDB, self).write(collection_name, data, query=query)
+                records.append(('write', (collection_name, data, query)))
+                return rval
+
+            if type(data) not in (list, tuple):
+                data = [data]
+
+            # Documents are inserted one at a time so that the ones inserted before a
+            # DuplicateKeyError still get recorded in the journal.
+            for document in data:
+                super(JournalDB, self).write(collection_name, document)
+                records.append(('write', (collection_name, document, None)))
+
+            return len(data)
+
+    def insert_many(self, collection_name, documents):
+        """Insert new documents in a collection, skipping duplicates.
+
+        .. seealso:: :meth:`AbstractDB.insert_many` for argument documentation.
+
+        """
+        with self._locked_journal() as records:
+            duplicates = []
+            for position, document in enumerate(documents):
+                try:
+                    super(JournalDB, self).write(collection_name, document)
+                except DuplicateKeyError:
+                    duplicates.append(position)
+                else:
+                    records.append(('write', (collection_name, document, None)))
+
+            return duplicates
+
+    def read(self, collection_name, query=None, selection=None):
+        """Read a collection and return a value according to the query.
+
+        .. seealso:: :meth:`AbstractDB.read` for argument documentation.
+
+        """
+        with self._synced_database():
+            return super(JournalDB, self).read(collection_name, query=query, selection=selection)
+
+    def read_and_write(self, collection_name, query, data, selection=None):
+        """Read a collection's document and update the found document.
+
+        Returns the updated document, or None if nothing found.
+
+        .. seealso:: :meth:`AbstractDB.read_and_write` for
+                     argument documentation.
+
+        """
+        # The update is recorded by `write`, reentrant locks make the whole operation atomic.
+        with self._locked_journal():
+            return super(JournalDB, self).read_and_write(collection_name, query=query, data=data,
+                                                         selection=selection)
+
+    def count(self, collection_name, query=None):
+        """Count the number of documents in a collection which match the `query`.
+
+        .. seealso:: :meth:`AbstractDB.count` for argument documentation.
+
+        """
+        with self._synced_database():
+            return super(JournalDB, self).count(collection_name, query=query)
+
+    def aggregate(self, collection_name, pipeline):
+        """Process the documents of a collection through an aggregation pipeline.
+
+        .. seealso:: :meth:`AbstractDB.aggregate` for argument documentation.
+
+        """
+        with self._synced_database():
+            return super(JournalDB, self).aggregate(collection_name, pipeline)
+
+    def remove(self, collection_name, query):
+        """Delete from a collection document[s] which match the `query`.
+
+        .. seealso:: :meth:`AbstractDB.remove` for argument documentation.
+
+        """
+        with self._locked_journal() as records:
+            rval = super(JournalDB, self).remove(collection_name, query=query)
+            records.append(('remove', (collection_name, query)))
+            return rval
+
+    def compact(self):
+        """Replace the journal by a single snapshot record of the current database"""
+        with self._state_lock, self._file_lock.acquire(timeout=60):
+            self._sync()
+            payload = _frame(('snapshot', dict(self._db)))
+
+            tmp_file = self.host + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(payload)
+
+            os.rename(tmp_file, self.host)
+
+            stat = os.stat(self.host)
+            self._journal_id = (stat.st_dev, stat.st_ino)
+            self._offset = len(payload)
+            self._n_records = 0
+
+    def _reset(self, journal_id=None):
+        """Drop in-memory state so that the journal gets replayed from the start"""
+        self._db = defaultdict(EphemeralCollection)
+        self._journal_id = journal_id
+        self._offset = 0
+        self._n_records = 0
+
+    def _apply(self, record):
+        """Replay a journal record on the in-memory database"""
+        operation, args = record
+        if operation == 'snapshot':
+            self._db = defaultdict(EphemeralCollection, args)
+            self._n_records = 0
+            return
+
+        getattr(super(JournalDB, self), operation)(*args)
+        self._n_records += 1
+
+    def _sync(self):
+        """Replay the records appended to the journal since last synchronisation"""
+        try:
+            journal = open(self.host, 'rb')
+        except FileNotFoundError:
+            if self._journal_id is not None:
+                self._reset()
+            return
+
+        with journal:
+            stat = os.fstat(journal.fileno())
+            journal_id = (stat.st_dev, stat.st_ino)
+            # Journal was compacted or truncated by another worker
+            if journal_id != self._journal_id or stat.st_size < self._offset:
+                self._reset(journal_id)
+
+            if stat.st_size == self._offset:
+                return
+
+            journal.seek(self._offset)
+            for record, offset in _iter_records(journal):
+                self._apply(record)
+                self._offset = offset
+
+    def _append(self, records):
+        """Append records at the end of the journal"""
+        try:
+            payload = b''.join(_frame(record) for record in records)
+        except (PicklingError, AttributeError):
+            for _, args in records:
+                for arg in filter(lambda arg: isinstance(arg, dict), args):
+                    key, value = find_unpickable_field(arg)
+                    if key is not None:
+                        log.error('because (value %s) in (field: %s) is not pickable',
+                                  value, key)
+            # In-memory database contains data that is not in the journal
+            self._reset()
+            raise
+
+        with open(self.host, 'ab') as journal:
+            stat = os.fstat(journal.fileno())
+            # Remove leftovers of a worker which died while appending.
+            if stat.st_size > self._offset:
+                journal.truncate(self._offset)
+            journal.write(payload)
+            self._journal_id = (stat.st_dev, stat.st_ino)
+            self._offset = journal.tell()
+
+        self._n_records += len(records)
+        if self._n_records >= self.compaction_threshold and (
+                self._compaction is None or not self._compaction.is_alive()):
+            self._compaction = threading.Thread(target=self.compact, daemon=True)
+            self._compaction.start()
+
+    @contextmanager
+    def _synced_database(self):
+        """Synchronise in-memory database with the journal during wrapped operation call."""
+        with self._state_lock:
+            self._sync()
+            yield
+
+    @contextmanager
+    def _locked_journal(self):
+        """Lock journal file during wrapped operation call and append resulting records."""
+        with self._state_lock, self._file_lock.acquire(timeout=60):
+            self._sync()
+            records = []
+            try:
+                yield records
+            finally:
+                if records:
+                    self._append(records)
@@ -12,6 +12,7 @@ import functools
 
 import pymongo
 
+import orion.core
 from orion.core.io.database import (
     AbstractDB, DatabaseError, DuplicateKeyError)
 
@@ -74,6 +75,18 @@ class MongoDB(AbstractDB):
     host : str
        Hostname or MongoDB compliant full credentials+address+database
        specification.
+    max_pool_size : int
+       Maximum number of connections of the client to the server. Defaults to
+       `orion.core.config.database.max_pool_size`.
+    write_concern : str or int
+       Number of servers acknowledging the writes, or 'majority'. Defaults to
+       `orion.core.config.database.write_concern`.
+    read_preference : str
+       Members of the replica set to read from, ex: 'primary' or 'secondaryPreferred'. Defaults
+       to `orion.core.config.database.read_preference`.
+    batch_size : int
+       Number of documents returned by the server in each batch of a read. 0 lets the server
+       decide. Defaults to `orion.core.config.database.batch_size`.
 
     Information on MongoDB `connection string
     <https://docs.mongodb.com/manual/reference/connection-string/>`_.
@@ -82,8 +95,10 @@ class MongoDB(AbstractDB):
 
     """
 
+    # pylint: disable=too-many-arguments
     def __init__(self, host='localhost', name=None,
-                 port=None, username=None, password=None, serverSelectionTimeoutMS=5000):
+                 port=None, username=None, password=None, serverSelectionTimeoutMS=5000,
+                 max_pool_size=None, write_concern=None, read_preference=None, batch_size=None):
         """Init method, see attributes of :class:`AbstractDB`."""
         self.uri = None
 
@@ -92,9 +107,32 @@ class MongoDB(AbstractDB):
         else:
             port = pymongo.MongoClient.PORT
 
+        config = orion.core.config.database
+        if max_pool_size is None:
+            max_pool_size = config.max_pool_size
+        if write_concern is None:
+            write_concern = config.write_concern
+        if read_preference is None:
+            read_preference = config.read_preference
+        if batch_size is None:
+            batch_size = config.batch_size
+
+        # Client options take precedence over the ones of the URI, they are only passed when set.
+        options = dict()
+        if max_pool_size is not None:
+            options['maxPoolSize'] = int(max_pool_size)
+        if write_concern is not None:
+            if isinstance(write_concern, str) and write_concern.isdigit():
+                write_concern = int(write_concern)
+            options['w'] = write_concern
+        if read_preference is not None:
+            options['readPreference'] = read_preference
+
+        self.batch_size = int(batch_size)
+
         super(MongoDB, self).__init__(host, name, port, username, password,
                                       serverSelectionTimeoutMS=serverSelectionTimeoutMS,
-                                      authSource=name)
+                                      authSource=name, **options)
 
     @mongodb_exception_wrapper
     def initiate_connection(self):
@@ -213,18 +251,50 @@ class MongoDB(AbstractDB):
                                           upsert=False)
         return result.modified_count
 
+    @mongodb_exception_wrapper
+    def insert_many(self, collection_name, documents):
+        """Insert new documents in a collection, skipping duplicates.
+
+        .. seealso:: :meth:`AbstractDB.insert_many` for argument documentation.
+
+        """
+        dbcollection = self._db[collection_name]
+
+        if not documents:
+            return []
+
+        try:
+            dbcollection.insert_many(documents=documents, ordered=False)
+        except pymongo.errors.BulkWriteError as e:
+            duplicates = []
+            for error in e.details['writeErrors']:
+                if not any(m in error["errmsg"] for m in DUPLICATE_KEY_MESSAGES):
+                    raise
+                duplicates.append(error['index'])
+
+            return sorted(duplicates)
+
+        return []
+
     def read(self, collection_name, query=None, selection=None):
         """Read a collection and return a value according to the query.
 
         .. seealso:: :meth:`AbstractDB.read` for argument documentation.
 
         """
-        dbcollection = self._db[collection_name]
+        return list(self.read_iter(collection_name, query=query, selection=selection))
+
+    def read_iter(self, collection_name, query=None, selection=None):
+        """Iterate over the documents of a collection matching the query.
 
-        cursor = dbcollection.find(query, selection)
-        dbdocs = list(cursor)
+        Documents are fetched from the server lazily, `batch_size` documents at a time.
+
+        .. seealso:: :meth:`AbstractDB.read` for argument documentation.
+
+        """
+        dbcollection = self._db[collection_name]
 
-        return dbdocs
+        return dbcollection.find(query, selection, batch_size=self.batch_size)
 
     @mongodb_exception_wrapper
     def read_and_write(self, collection_name, query, data, selection=None):
@@ -258,6 +328,16 @@ class MongoDB(AbstractDB):
 
         return dbcollection.count(filter=query)
 
+    def aggregate(self, collection_name, pipeline):
+        """Process the documents of a collection through an aggregation pipeline.
+
+        .. seealso:: :meth:`AbstractDB.aggregate` for argument documentation.
+
+        """
+        dbcollection = self._db[collection_name]
+
+        return list(dbcollection.aggregate(pipeline))
+
     def remove(self, collection_name, query):
         """Delete from a collection document[s] which match the `query`.
 
@@ -95,7 +95,7 @@ class PickledDB(AbstractDB):
     def ensure_index(self, collection_name, keys, unique=False):
         """Create given indexes if they do not already exist in database.
 
-        Indexes are only created if `unique` is True.
+        Only unique indexes are enforced, all indexes are used to speed up queries.
         """
         with self.locked_database() as database:
             database.ensure_index(collection_name, keys, unique=unique)
@@ -119,6 +119,15 @@ class PickledDB(AbstractDB):
         with self.locked_database() as database:
             return database.write(collection_name, data, query=query)
 
+    def insert_many(self, collection_name, documents):
+        """Insert new documents in a collection, skipping duplicates.
+
+        .. seealso:: :meth:`AbstractDB.insert_many` for argument documentation.
+
+        """
+        with self.locked_database() as database:
+            return database.insert_many(collection_name, documents)
+
     def read(self, collection_name, query=None, selection=None):
         """Read a collection and return a value according to the query.
 
@@ -150,6 +159,15 @@ class PickledDB(AbstractDB):
         with self.locked_database(write=False) as database:
             return database.count(collection_name, query=query)
 
+    def aggregate(self, collection_name, pipeline):
+        """Process the documents of a collection through an aggregation pipeline.
+
+        .. seealso:: :meth:`AbstractDB.aggregate` for argument documentation.
+
+        """
+        with self.locked_database(write=False) as database:
+            return database.aggregate(collection_name, pipeline)
+
     def remove(self, collection_name, query):
         """Delete from a collection document[s] which match the `query`.
 
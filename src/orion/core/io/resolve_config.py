@@ -61,6 +61,7 @@ log = logging.getLogger(__name__)
 DEF_CMD_MAX_TRIALS = (infinity, 'inf/until preempted')
 DEF_CMD_WORKER_TRIALS = (infinity, 'inf/until preempted')
 DEF_CMD_POOL_SIZE = (1, str(1))
+DEF_CMD_N_WORKERS = (1, str(1))
 
 # list containing tuples of
 # (environmental variable names, configuration keys, default values)
@@ -109,6 +110,7 @@ def fetch_default_options():
     default_config['max_trials'] = DEF_CMD_MAX_TRIALS[0]
     default_config['worker_trials'] = DEF_CMD_WORKER_TRIALS[0]
     default_config['pool_size'] = DEF_CMD_POOL_SIZE[0]
+    default_config['n_workers'] = DEF_CMD_N_WORKERS[0]
     default_config['algorithms'] = 'random'
 
     # get default options for some managerial variables (see :const:`ENV_VARS`)
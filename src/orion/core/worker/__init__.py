@@ -12,75 +12,266 @@
 import io
 import itertools
 import logging
+import math
 import pprint
+import random
+import signal
+import threading
+import time
 
-from orion.core.worker.consumer import Consumer
+import orion.core
+from orion.core.worker.consumer import _handler, Consumer
 from orion.core.worker.producer import Producer
-from orion.storage.base import get_storage
 
 log = logging.getLogger(__name__)
 
+# Bounds in seconds of the delay between failed reservations
+BASE_BACKOFF = 0.1
+MAX_BACKOFF = 10
 
-def reserve_trial(experiment, producer):
-    """Reserve a new trial, or produce and reserve a trial if none are available."""
-    trial = experiment.reserve_trial(score_handle=producer.algorithm.score)
 
-    if trial is None and not experiment.is_done:
+class ReservationMetrics(object):
+    """Count the attempts and measure the latency of trial reservations of a worker."""
+
+    def __init__(self):
+        self.reservations = 0
+        self.attempts = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, attempts, latency):
+        """Record a reservation which took `attempts` attempts and `latency` seconds."""
+        self.reservations += 1
+        self.attempts += attempts
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    @property
+    def mean_latency(self):
+        """Mean number of seconds to reserve a trial"""
+        if not self.reservations:
+            return 0.0
+
+        return self.total_latency / self.reservations
+
+    def __str__(self):
+        """Summarize the reservations"""
+        return ("{} reservations in {} attempts, latency mean: {:.3f}s, max: {:.3f}s".format(
+            self.reservations, self.attempts, self.mean_latency, self.max_latency))
+
+
+def _backoff_delay(retries):
+    """Return a random delay growing exponentially with the number of `retries`.
+
+    The delay is drawn uniformly up to the exponential bound so that workers competing for the
+    same trials do not retry in lockstep.
+    """
+    if retries >= math.log2(MAX_BACKOFF / BASE_BACKOFF):
+        return random.uniform(0, MAX_BACKOFF)
+
+    return random.uniform(0, BASE_BACKOFF * 2 ** retries)
+
+
+def reserve_trial(experiment, producer, max_wait=None, metrics=None):
+    """Reserve a new trial, or produce and reserve a trial if none are available.
+
+    When trials produced are reserved by other workers before this one, the worker backs off for
+    an exponentially growing delay before producing again.
+
+    :param max_wait: Number of seconds after which to give up reserving a trial. Defaults to
+       `worker.max_reservation_wait`.
+    :param metrics: `ReservationMetrics` recording the reservation, if given.
+    :raises RuntimeError: If no trial could be reserved in less than `max_wait` seconds.
+    """
+    if max_wait is None:
+        max_wait = orion.core.config.worker.max_reservation_wait
+
+    start = time.time()
+    attempts = 0
+    while True:
+        attempts += 1
+        trial = experiment.reserve_trial(score_handle=producer.algorithm.score)
+
+        if trial is not None or experiment.is_done:
+            break
+
         log.debug("#### Failed to pull a new trial from database.")
 
+        elapsed = time.time() - start
+        if elapsed >= max_wait:
+            raise RuntimeError(
+                "Could not reserve a trial in less than {} seconds".format(max_wait))
+
+        if attempts > 1:
+            delay = min(_backoff_delay(attempts - 2), max_wait - elapsed)
+            log.debug("#### Trials produced were reserved by other workers, waiting %.2f "
+                      "seconds.", delay)
+            time.sleep(delay)
+
         log.debug("#### Fetch most recent completed trials and update algorithm.")
         producer.update()
 
         log.debug("#### Produce new trials.")
         producer.produce()
 
-        return reserve_trial(experiment, producer)
+    latency = time.time() - start
+    log.debug("#### Reservation took %d attempts and %.3f seconds.", attempts, latency)
+    if metrics is not None:
+        metrics.record(attempts, latency)
 
     return trial
 
 
-def workon(experiment, worker_trials=None):
-    """Try to find solution to the search problem defined in `experiment`."""
-    producer = Producer(experiment)
-    consumer = Consumer(experiment)
-
-    log.debug("#####  Init Experiment  #####")
-    try:
-        iterator = range(int(worker_trials))
-    except (OverflowError, TypeError):
-        # When worker_trials is inf
-        iterator = itertools.count()
-
+def _workon(experiment, producer, consumer, iterator, metrics=None):
+    """Evaluate trials one at a time, return False if the experiment is broken."""
     for _ in iterator:
         log.debug("#### Poll for experiment termination.")
         if experiment.is_broken:
             log.info("#### Experiment has reached broken trials threshold, terminating.")
-            return
+            return False
 
         if experiment.is_done:
             break
 
         log.debug("#### Try to reserve a new trial to evaluate.")
-        trial = reserve_trial(experiment, producer)
+        trial = reserve_trial(experiment, producer, metrics=metrics)
 
         if trial is not None:
             log.debug("#### Successfully reserved %s to evaluate. Consuming...", trial)
             consumer.consume(trial)
 
+    return True
+
+
+class _ConcurrentWorkon(object):
+    """Evaluate trials concurrently, each consumer in a thread of its own.
+
+    Threads share the producer and the trial budget of the worker. Reservation and production
+    of trials are serialized with a lock so that new trials are produced only once for all
+    threads, while the user's scripts are executed concurrently in separate processes.
+
+    """
+
+    def __init__(self, experiment, producer, iterator, consumers, metrics=None):
+        self.experiment = experiment
+        self.producer = producer
+        self.iterator = iterator
+        self.consumers = consumers
+        self.metrics = metrics
+        self.broken = False
+        self.errors = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def run(self):
+        """Execute all threads until the worker is done, return False if the experiment is
+        broken.
+        """
+        threads = [threading.Thread(target=self._work, args=(consumer, ), daemon=True)
+                   for consumer in self.consumers]
+
+        signal.signal(signal.SIGTERM, _handler)
+        try:
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                # Join with a timeout so that the main thread remains interruptible.
+                while thread.is_alive():
+                    thread.join(1)
+        except KeyboardInterrupt:
+            self.interrupt()
+            for thread in threads:
+                thread.join()
+            raise
+
+        if self.errors:
+            raise self.errors[0]
+
+        return not self.broken
+
+    def interrupt(self):
+        """Stop all threads and interrupt the trials being evaluated."""
+        self._stopped.set()
+        for consumer in self.consumers:
+            consumer.interrupt()
+
+    def _next_trial(self):
+        """Reserve the next trial to evaluate, or return None if the worker is done."""
+        with self._lock:
+            if self._stopped.is_set() or next(self.iterator, None) is None:
+                return None
+
+            log.debug("#### Poll for experiment termination.")
+            if self.experiment.is_broken:
+                log.info("#### Experiment has reached broken trials threshold, terminating.")
+                self.broken = True
+                self._stopped.set()
+                return None
+
+            if self.experiment.is_done:
+                self._stopped.set()
+                return None
+
+            log.debug("#### Try to reserve a new trial to evaluate.")
+            return reserve_trial(self.experiment, self.producer, metrics=self.metrics)
+
+    def _work(self, consumer):
+        """Consume trials until the worker is done."""
+        try:
+            trial = self._next_trial()
+            while trial is not None:
+                log.debug("#### Successfully reserved %s to evaluate. Consuming...", trial)
+                consumer.consume(trial)
+                trial = self._next_trial()
+        except KeyboardInterrupt:
+            self._stopped.set()
+        except BaseException as e:  # pylint:disable=broad-except
+            log.error("#### Worker thread failed: %s", e)
+            self.errors.append(e)
+            self.interrupt()
+
+
+def workon(experiment, worker_trials=None, n_workers=1):
+    """Try to find solution to the search problem defined in `experiment`.
+
+    With `n_workers` greater than 1, that many trials are evaluated concurrently by this worker.
+    """
+    producer = Producer(experiment)
+
+    log.debug("#####  Init Experiment  #####")
+    try:
+        iterator = iter(range(int(worker_trials)))
+    except (OverflowError, TypeError):
+        # When worker_trials is inf
+        iterator = itertools.count()
+
+    metrics = ReservationMetrics()
+    if n_workers > 1:
+        consumers = [Consumer(experiment) for _ in range(n_workers)]
+        completed = _ConcurrentWorkon(experiment, producer, iterator, consumers, metrics).run()
+    else:
+        completed = _workon(experiment, producer, Consumer(experiment), iterator, metrics)
+
+    log.info("#### Trial reservations: %s", metrics)
+
+    if not completed:
+        return
+
     stats = experiment.stats
 
     if not stats:
         log.info("No trials completed.")
         return
 
-    best = get_storage().get_trial(uid=stats['best_trials_id'])
+    best_params = stats.pop('best_params')
 
     stats_stream = io.StringIO()
     pprint.pprint(stats, stream=stats_stream)
     stats_string = stats_stream.getvalue()
 
     best_stream = io.StringIO()
-    pprint.pprint(best.to_dict()['params'], stream=best_stream)
+    pprint.pprint(best_params, stream=best_stream)
     best_string = best_stream.getvalue()
 
     log.info("#####  Search finished successfully  #####")
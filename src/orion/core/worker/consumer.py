@@ -13,6 +13,7 @@ import os
 import signal
 import subprocess
 import tempfile
+import threading
 
 import orion.core
 from orion.core.io.orion_cmdline_parser import OrionCmdlineParser
@@ -72,6 +73,9 @@ class Consumer(object):
         self.script_path = experiment.metadata['user_script']
 
         self.pacemaker = None
+        self.interrupted = False
+        self._process = None
+        self._process_lock = threading.Lock()
 
     def consume(self, trial):
         """Execute user's script as a block box using the options contained
@@ -190,10 +194,36 @@ class Consumer(object):
         """Facilitate launching a black-box trial."""
         command = [self.script_path] + cmd_args
 
-        signal.signal(signal.SIGTERM, _handler)
-        process = subprocess.Popen(command, env=environ)
+        # Signal handlers can only be set from the main thread. Consumers running in other
+        # threads are interrupted through `Consumer.interrupt` instead.
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, _handler)
+
+        with self._process_lock:
+            if self.interrupted:
+                raise KeyboardInterrupt
+
+            self._process = subprocess.Popen(command, env=environ)
+
+        try:
+            return_code = self._process.wait()
+        finally:
+            self._process = None
+
+        if self.interrupted:
+            raise KeyboardInterrupt
 
-        return_code = process.wait()
         if return_code != 0:
             raise ExecutionError("Something went wrong. Check logs. Process "
                                  "returned with code {} !".format(return_code))
+
+    def interrupt(self):
+        """Terminate the user's script being executed and interrupt the consumer
+
+        This is meant to be called from another thread than the one consuming trials. The trial
+        being evaluated will be saved as interrupted.
+        """
+        with self._process_lock:
+            self.interrupted = True
+            if self._process is not None:
+                self._process.terminate()
@@ -159,9 +159,13 @@ class Experiment:
                     setattr(self, attrname, config[attrname])
             self._id = config['_id']
 
-    def fetch_trials(self, with_evc_tree=False):
-        """Fetch all trials of the experiment"""
-        return self._select_evc_call(with_evc_tree, 'fetch_trials')
+    def fetch_trials(self, with_evc_tree=False, selection=None):
+        """Fetch all trials of the experiment
+
+        If `selection` is given, only the selected fields are fetched and the trials are
+        returned as read-only `TrialView` objects, unless they are fetched from the EVC tree.
+        """
+        return self._select_evc_call(with_evc_tree, 'fetch_trials', selection=selection)
 
     def get_trial(self, trial=None, uid=None):
         """Fetch a single Trial, see `orion.storage.base.BaseStorage.get_trial`"""
@@ -300,20 +304,55 @@ class Experiment:
 
         self._storage.register_trial(trial)
 
-    def _select_evc_call(self, with_evc_tree, function, *args, **kwargs):
+    def register_trials(self, trials):
+        """Register a batch of new trials in the database.
+
+        Inform database about *new* suggested trials with specific parameter values. Trials which
+        already exist in the database are not registered and do not prevent the registration of
+        the others.
+
+        Parameters
+        ----------
+        trials: list of `Trial` objects
+            Trials to register in the database
+
+        Returns
+        -------
+        list of `Trial` objects
+            Trials which were not registered because a trial with the same id already exists in
+            the database. Since the id is computed based on a hashing of the trial, this should mean
+            that an identical trial already exist in the database.
+
+        """
+        stamp = datetime.datetime.utcnow()
+        for trial in trials:
+            trial.experiment = self._id
+            trial.status = 'new'
+            trial.submit_time = stamp
+
+        return self._storage.register_trials(trials)
+
+    def _select_evc_call(self, with_evc_tree, function, *args, selection=None, **kwargs):
         if self._node is not None and with_evc_tree:
+            # Trials must be complete to be adapted by the EVC tree
             return getattr(self._node, function)(*args, **kwargs)
 
+        if selection is not None:
+            kwargs['selection'] = selection
+
         return getattr(self._storage, function)(self, *args, **kwargs)
 
-    def fetch_trials_by_status(self, status, with_evc_tree=False):
+    def fetch_trials_by_status(self, status, with_evc_tree=False, selection=None):
         """Fetch all trials with the given status
 
         Trials are sorted based on `Trial.submit_time`
 
+        .. seealso:: :meth:`fetch_trials` for the meaning of `selection`.
+
         :return: list of `Trial` objects
         """
-        return self._select_evc_call(with_evc_tree, 'fetch_trial_by_status', status)
+        return self._select_evc_call(with_evc_tree, 'fetch_trial_by_status', status,
+                                     selection=selection)
 
     def fetch_noncompleted_trials(self, with_evc_tree=False):
         """Fetch non-completed trials of this `Experiment` instance.
@@ -329,6 +368,16 @@ class Experiment:
         """
         return self._select_evc_call(with_evc_tree, 'fetch_noncompleted_trials')
 
+    def fetch_completed_trials(self, since=None):
+        """Fetch completed trials of this `Experiment` instance.
+
+        Trials are sorted based on `Trial.submit_time`
+
+        :param since: Only fetch trials completed at or after this `datetime.datetime` if given.
+        :return: list of completed `Trial` objects
+        """
+        return self._storage.fetch_completed_trials(self, since=since)
+
     # pylint: disable=invalid-name
     @property
     def id(self):
@@ -433,6 +482,8 @@ class Experiment:
            the best known objective result.
         best_evaluation : float
            Evaluation score of the best trial
+        best_params : dict
+           Values of the parameters of the best trial, by name.
         start_time : `datetime.datetime`
            When Experiment was first dispatched and started running.
         finish_time : `datetime.datetime`
@@ -441,27 +492,23 @@ class Experiment:
            Elapsed time.
 
         """
-        completed_trials = self.fetch_trials_by_status('completed')
+        trials_stats = self._storage.fetch_trials_stats(self)
 
-        if not completed_trials:
+        if not trials_stats:
             return dict()
         stats = dict()
-        stats['trials_completed'] = len(completed_trials)
-        stats['best_trials_id'] = None
-        trial = completed_trials[0]
-        stats['best_evaluation'] = trial.objective.value
-        stats['best_trials_id'] = trial.id
+        stats['trials_completed'] = trials_stats['trials_completed']
+        stats['best_trials_id'] = trials_stats['best_id']
+        stats['best_evaluation'] = trials_stats['best_objective']
+        stats['best_params'] = dict((param['name'], param['value'])
+                                    for param in trials_stats['best_params'] or [])
         stats['start_time'] = self.metadata['datetime']
         stats['finish_time'] = stats['start_time']
-        for trial in completed_trials:
-            # All trials are going to finish certainly after the start date
-            # of the experiment they belong to
-            if trial.end_time > stats['finish_time']:  # pylint:disable=no-member
-                stats['finish_time'] = trial.end_time
-            objective = trial.objective.value
-            if objective < stats['best_evaluation']:
-                stats['best_evaluation'] = objective
-                stats['best_trials_id'] = trial.id
+        # All trials are going to finish certainly after the start date
+        # of the experiment they belong to
+        if trials_stats['finish_time'] is not None and \
+                trials_stats['finish_time'] > stats['finish_time']:
+            stats['finish_time'] = trials_stats['finish_time']
         stats['duration'] = stats['finish_time'] - stats['start_time']
 
         return stats
@@ -58,6 +58,20 @@ class PrimaryAlgo(BaseAlgorithm):
         """
         self.algorithm.set_state(state_dict)
 
+    def snapshot(self):
+        """Return a snapshot of the observations of the algorithm, to be restored with `rollback`.
+
+        .. seealso:: `orion.algo.base.BaseAlgorithm.snapshot`
+        """
+        return self.algorithm.snapshot()
+
+    def rollback(self, snapshot):
+        """Discard all observations made since the given snapshot was taken.
+
+        .. seealso:: `orion.algo.base.BaseAlgorithm.rollback`
+        """
+        self.algorithm.rollback(snapshot)
+
     def suggest(self, num=1):
         """Suggest a `num` of new sets of parameters.
 
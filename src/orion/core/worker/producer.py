@@ -9,6 +9,7 @@
 
 """
 import copy
+import datetime
 import logging
 import random
 import time
@@ -30,11 +31,18 @@ class Producer(object):
 
     """
 
-    def __init__(self, experiment, max_idle_time=None):
+    def __init__(self, experiment, max_idle_time=None, completion_margin=None,
+                 resync_interval=None):
         """Initialize a producer.
 
         :param experiment: Manager of this experiment, provides convenient
            interface for interacting with the database.
+        :param completion_margin: Number of seconds before the last completion time seen from
+           which completed trials are fetched again. Completion times are set by the workers
+           before the trials are written to the database, so trials completed shortly before the
+           last one seen may only get written afterwards.
+        :param resync_interval: Number of seconds between fetches of all completed trials, to
+           observe the ones written later than `completion_margin`.
         """
         log.debug("Creating Producer object.")
         self.experiment = experiment
@@ -46,22 +54,36 @@ class Producer(object):
         if max_idle_time is None:
             max_idle_time = orion.core.config.worker.max_idle_time
         self.max_idle_time = max_idle_time
+        if completion_margin is None:
+            completion_margin = orion.core.config.worker.completion_margin
+        self.completion_margin = datetime.timedelta(seconds=completion_margin)
+        if resync_interval is None:
+            resync_interval = orion.core.config.worker.resync_interval
+        self.resync_interval = resync_interval
         self.strategy = experiment.producer['strategy']
         self.naive_algorithm = None
+        self._lies_snapshot = None
         # TODO: Move trials_history into PrimaryAlgo during the refactoring of Algorithm with
         #       Strategist and Scheduler.
         self.trials_history = TrialsHistory()
         self.naive_trials_history = None
+        self._last_end_time = None
+        self._last_resync = None
 
     @property
     def pool_size(self):
         """Pool-size of the experiment"""
         return self.experiment.pool_size
 
-    def backoff(self):
-        """Wait some time and update algorithm."""
-        waiting_time = min(0, random.gauss(1, 0.2))
-        log.info('Waiting %d seconds', waiting_time)
+    def backoff(self, max_wait=None):
+        """Wait some time and update algorithm.
+
+        :param max_wait: Maximum number of seconds to wait, if any.
+        """
+        waiting_time = max(0, random.gauss(1, 0.2))
+        if max_wait is not None:
+            waiting_time = max(0, min(waiting_time, max_wait))
+        log.info('Waiting %.2f seconds', waiting_time)
         time.sleep(waiting_time)
         log.info('Updating algorithm.')
         self.update()
@@ -72,7 +94,8 @@ class Producer(object):
 
         start = time.time()
         while sampled_points < self.pool_size and not self.algorithm.is_done:
-            if time.time() - start > self.max_idle_time:
+            idle_time = time.time() - start
+            if idle_time > self.max_idle_time:
                 raise RuntimeError(
                     "Algorithm could not sample new points in less than {} seconds".format(
                         self.max_idle_time))
@@ -80,37 +103,72 @@ class Producer(object):
             log.debug("### Algorithm suggests new points.")
 
             new_points = self.naive_algorithm.suggest(self.pool_size)
-            # Sync state of original algo so that state continues evolving.
-            self.algorithm.set_state(self.naive_algorithm.state_dict)
             if new_points is None:
                 log.info("### Algo opted out.")
-                self.backoff()
+                self.backoff(self.max_idle_time - idle_time)
                 continue
 
+            new_trials = []
             for new_point in new_points:
                 log.debug("#### Convert point to `Trial` object.")
                 new_trial = format_trials.tuple_to_trial(new_point, self.space)
-                try:
-                    new_trial.parents = self.naive_trials_history.children
-                    log.debug("#### Register new trial to database: %s", new_trial)
-                    self.experiment.register_trial(new_trial)
-                    sampled_points += 1
-                except DuplicateKeyError:
-                    log.debug("#### Duplicate sample.")
-                    self.backoff()
-                    break
+                new_trial.parents = self.naive_trials_history.children
+                new_trials.append(new_trial)
+
+            log.debug("#### Register new trials to database: %s", new_trials)
+            duplicates = self.experiment.register_trials(new_trials)
+            sampled_points += len(new_trials) - len(duplicates)
+
+            if duplicates:
+                log.debug("#### Duplicate samples: %s", duplicates)
+                self.backoff(self.max_idle_time - idle_time)
 
     def update(self):
-        """Pull all trials to update model with completed ones and naive model with non completed
-        ones.
+        """Pull newly completed trials to update model and all non completed ones to update naive
+        model.
+
+        Only the trials completed since the last update are fetched, with a margin of
+        `completion_margin` to account for trials being written late. The ones already observed
+        are filtered out using the trials history. All completed trials are fetched again every
+        `resync_interval` seconds in case some were written later than the margin.
         """
-        trials = self.experiment.fetch_trials()
+        since = None
+        resync = self._last_end_time is None or (
+            time.time() - self._last_resync >= self.resync_interval)
+        if resync:
+            self._last_resync = time.time()
+        else:
+            since = self._last_end_time - self.completion_margin
+
+        completed_trials = self.experiment.fetch_completed_trials(since=since)
 
-        self._update_algorithm([trial for trial in trials if trial.status == 'completed'])
-        self._update_naive_algorithm([trial for trial in trials if trial.status != 'completed'])
+        if resync and self._last_end_time is not None:
+            self._warn_late_trials(completed_trials)
+
+        for trial in completed_trials:
+            if trial.end_time is not None and (
+                    self._last_end_time is None or trial.end_time > self._last_end_time):
+                self._last_end_time = trial.end_time
+
+        self._update_algorithm(completed_trials)
+        self._update_naive_algorithm(self.experiment.fetch_noncompleted_trials())
+
+    def _warn_late_trials(self, completed_trials):
+        """Warn about trials which were missed by the incremental fetches"""
+        cursor = self._last_end_time - self.completion_margin
+        late_trials = [trial for trial in completed_trials
+                       if trial not in self.trials_history and
+                       (trial.end_time is None or trial.end_time < cursor)]
+        if late_trials:
+            log.warning(
+                '%d completed trials were written more than %s after their completion time. '
+                'Workers clocks may be out of sync, consider increasing '
+                '`worker.completion_margin`.', len(late_trials), self.completion_margin)
 
     def _update_algorithm(self, completed_trials):
         """Pull newest completed trials to update local model."""
+        self._discard_lies()
+
         log.debug("### Fetch completed trials to observe:")
 
         new_completed_trials = []
@@ -156,10 +214,29 @@ class Producer(object):
 
         return lying_trials
 
+    def _discard_lies(self):
+        """Rollback the observations of lies made by the naive algorithm"""
+        if self._lies_snapshot is None:
+            return
+
+        log.debug("### Discard lies observed by the naive algorithm.")
+        # Keep the state of the algorithm evolving, otherwise it would suggest the same points.
+        state_dict = self.algorithm.state_dict
+        self.algorithm.rollback(self._lies_snapshot)
+        self.algorithm.set_state(state_dict)
+        self._lies_snapshot = None
+
     def _update_naive_algorithm(self, incomplete_trials):
-        """Pull all non completed trials to update naive model."""
-        self.naive_algorithm = copy.deepcopy(self.algorithm)
-        self.naive_trials_history = copy.deepcopy(self.trials_history)
+        """Pull all non completed trials to update naive model.
+
+        The naive model is the algorithm itself observing the lies on top of the completed
+        trials. The lies are discarded with a rollback before the next update instead of copying
+        the whole algorithm.
+        """
+        self._discard_lies()
+        self._lies_snapshot = self.algorithm.snapshot()
+        self.naive_algorithm = self.algorithm
+        self.naive_trials_history = self.trials_history.fork()
         log.debug("### Create fake trials to observe:")
         lying_trials = self._produce_lies(incomplete_trials)
         log.debug("### %s", lying_trials)
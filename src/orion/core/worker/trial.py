@@ -332,3 +332,101 @@ class Trial:
                         "Optimizing according to the first one only: %s", value[0])
 
         return value[0]
+
+
+class TrialView:
+    """Read-only view of a partially fetched entry of database/trials collection.
+
+    Only the fields of the trial selected when fetching it from the storage are available. They
+    are decoded lazily, so that `params` and `results` are only converted to `Trial.Param` and
+    `Trial.Result` objects when accessed. Accessing a field which was not fetched raises an
+    `AttributeError`.
+
+    Attributes
+    ----------
+    id : str
+       Database key `_id` of the trial, read as is rather than being computed from `params`.
+
+    .. seealso:: :class:`Trial` for the meaning of the other attributes.
+
+    """
+
+    __slots__ = ('_document', '_params', '_results')
+    fields = ('experiment', 'status', 'worker', 'heartbeat', 'submit_time', 'start_time',
+              'end_time', 'parents')
+
+    def __init__(self, document):
+        """Wrap a trial document as returned by the database"""
+        self._document = document
+        self._params = None
+        self._results = None
+
+    def __getattr__(self, attrname):
+        """Return the raw value of a fetched field"""
+        if attrname not in self.fields:
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                type(self).__name__, attrname))
+
+        return self._get_field(attrname)
+
+    def _get_field(self, name):
+        try:
+            return self._document[name]
+        except KeyError:
+            raise AttributeError("Field '{}' of the trial was not fetched".format(name)) from None
+
+    def __str__(self):
+        """Represent partially with a string."""
+        return "TrialView(id={0}, fields={1})".format(
+            repr(self.id), sorted(key for key in self._document if key != '_id'))
+
+    __repr__ = __str__
+
+    @property
+    def id(self):
+        """Return the database key `_id`."""
+        return self._get_field('_id')
+
+    @property
+    def params(self):
+        """List of `Trial.Param` of the trial, decoded on first access"""
+        if self._params is None:
+            self._params = [Trial.Param(**item) for item in self._get_field('params')]
+
+        return self._params
+
+    @property
+    def results(self):
+        """List of `Trial.Result` of the trial, decoded on first access"""
+        if self._results is None:
+            self._results = [Trial.Result(**item) for item in self._get_field('results')]
+
+        return self._results
+
+    @property
+    def objective(self):
+        """Return this trial's objective value if it is evaluated, else None.
+
+        :rtype: `Trial.Result`
+        """
+        return Trial._fetch_one_result_of_type(self, 'objective')
+
+    @property
+    def lie(self):
+        """Return this trial's fake objective value if it was set, else None.
+
+        :rtype: `Trial.Result`
+        """
+        return Trial._fetch_one_result_of_type(self, 'lie')
+
+    @property
+    def gradient(self):
+        """Return this trial's gradient value if it is evaluated, else None.
+
+        :rtype: `Trial.Result`
+        """
+        return Trial._fetch_one_result_of_type(self, 'gradient')
+
+    def to_trial(self):
+        """Build a complete `Trial` out of the fetched fields"""
+        return Trial(**self._document)
@@ -7,46 +7,146 @@
    :synopsis: Monitor trials and update their heartbeat
 
 """
+import logging
 import threading
+import time
 
 from orion.storage.base import get_storage
 
-STOPPED_STATUS = {'completed', 'interrupted', 'suspended'}
+log = logging.getLogger(__name__)
 
 
-class TrialPacemaker(threading.Thread):
-    """Monitor a given trial inside a thread, updating its heartbeat
-    at a given interval of time.
+class HeartbeatService(object):
+    """Update the heartbeats of all the trials monitored in a process
+
+    A single thread updates the heartbeats of all registered pacemakers with one query. Whenever a
+    pacemaker is due, the heartbeats of all the others are updated as well so that they stay
+    batched together. The thread stops when no pacemakers are left.
+
+    """
+
+    def __init__(self, clock=time.monotonic, threaded=True):
+        """Create a service without any pacemakers
+
+        :param clock: Function returning the current time in seconds.
+        :param threaded: Whether heartbeats are updated in a background thread. Otherwise,
+           `beat` must be called to update them.
+        """
+        self._clock = clock
+        self._threaded = threaded
+        self._condition = threading.Condition()
+        self._deadlines = dict()
+        self._thread = None
+
+    def register(self, pacemaker):
+        """Start updating the heartbeat of the pacemaker's trial"""
+        with self._condition:
+            self._deadlines[pacemaker] = self._clock() + pacemaker.wait_time
+            if self._threaded and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def unregister(self, pacemaker):
+        """Stop updating the heartbeat of the pacemaker's trial"""
+        with self._condition:
+            self._deadlines.pop(pacemaker, None)
+            self._condition.notify()
+
+    def beat(self):
+        """Update the heartbeats of all pacemakers if any of them is due
+
+        Returns True if heartbeats were updated.
+        """
+        with self._condition:
+            if not self._deadlines or self._next_delay() > 0:
+                return False
+
+            pacemakers = self._reschedule()
+
+        self._beat(pacemakers)
+        return True
+
+    def _next_delay(self):
+        """Return the number of seconds until the next pacemaker is due"""
+        return min(self._deadlines.values()) - self._clock()
+
+    def _reschedule(self):
+        """Set the next deadline of all pacemakers and return them"""
+        now = self._clock()
+        pacemakers = list(self._deadlines)
+        for pacemaker in pacemakers:
+            self._deadlines[pacemaker] = now + pacemaker.wait_time
+
+        return pacemakers
+
+    def _run(self):
+        with self._condition:
+            while self._deadlines:
+                delay = self._next_delay()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+
+                pacemakers = self._reschedule()
+
+                self._condition.release()
+                try:
+                    self._beat(pacemakers)
+                finally:
+                    self._condition.acquire()
+
+            self._thread = None
+
+    def _beat(self, pacemakers):
+        try:
+            stopped_trials = get_storage().update_heartbeats(
+                [pacemaker.trial for pacemaker in pacemakers])
+        except Exception:  # pylint: disable=broad-except
+            log.warning('Failed to update heartbeats of trials', exc_info=True)
+            return
+
+        stopped_ids = set(trial.id for trial in stopped_trials)
+        for pacemaker in pacemakers:
+            if pacemaker.trial.id in stopped_ids:
+                pacemaker.stop()
+
+
+HEARTBEAT_SERVICE = HeartbeatService()
+
+
+class TrialPacemaker(object):
+    """Monitor a given trial, updating its heartbeat at a given interval of time.
+
+    Heartbeats of all the trials of the process are updated together by the `HeartbeatService`.
+    Monitoring stops by itself when the trial is not reserved anymore.
 
     Parameters
     ----------
-    exp: Experiment
-        The current Experiment.
+    trial: Trial
+        The trial to monitor.
+    wait_time: int
+        Interval of time in seconds between heartbeats.
+    service: HeartbeatService, optional
+        Service updating the heartbeats. Defaults to the one shared by the whole process.
 
     """
 
-    def __init__(self, trial, wait_time=60):
-        threading.Thread.__init__(self)
+    def __init__(self, trial, wait_time=60, service=None):
         self.stopped = threading.Event()
         self.trial = trial
         self.wait_time = wait_time
-        self.storage = get_storage()
+        self.service = service if service is not None else HEARTBEAT_SERVICE
+
+    def start(self):
+        """Start monitoring."""
+        self.service.register(self)
 
     def stop(self):
         """Stop monitoring."""
+        self.service.unregister(self)
         self.stopped.set()
-        self.join()
-
-    def run(self):
-        """Run the trial monitoring every given interval."""
-        while not self.stopped.wait(self.wait_time):
-            self._monitor_trial()
-
-    def _monitor_trial(self):
-        trial = self.storage.get_trial(self.trial)
 
-        if trial.status in STOPPED_STATUS:
-            self.stopped.set()
-        else:
-            if not self.storage.update_heartbeat(trial):
-                self.stopped.set()
+    def join(self, timeout=None):
+        """Wait until monitoring stops."""
+        self.stopped.wait(timeout)
@@ -19,6 +19,16 @@ class TrialsHistory:
         self.children = []
         self.ids = set()
 
+    def fork(self):
+        """Return a new history starting from the same children
+
+        Ids of the trials observed so far are not copied, the forked history is only meant to
+        track the children of trials observed temporarily.
+        """
+        history = TrialsHistory()
+        history.children = list(self.children)
+        return history
+
     def __contains__(self, trial):
         """Return True if the trial is in the observed history"""
         return trial.id in self.ids
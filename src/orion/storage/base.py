@@ -75,6 +75,25 @@ class BaseStorageProtocol(metaclass=AbstractSingletonType):
         """Create a new trial to be executed"""
         raise NotImplementedError()
 
+    def register_trials(self, trials):
+        """Create a batch of new trials to be executed
+
+        Trials are registered all at once. Registration is not aborted when a trial already
+        exists in the storage.
+
+        Parameters
+        ----------
+        trials: list of `Trial` objects
+            Trials to register in the storage
+
+        Returns
+        -------
+        list of `Trial` objects
+            Trials which were not registered because they were duplicates of existing ones
+
+        """
+        raise NotImplementedError()
+
     def register_lie(self, trial):
         """Register a *fake* trial created by the strategist.
 
@@ -186,14 +205,46 @@ class BaseStorageProtocol(metaclass=AbstractSingletonType):
         """Fetch all non completed trials"""
         raise NotImplementedError()
 
-    def fetch_trial_by_status(self, experiment, status):
-        """Fetch all trials with the given status"""
+    def fetch_completed_trials(self, experiment, since=None):
+        """Fetch completed trials, only the ones completed at or after `since` if given
+
+        Parameters
+        ----------
+        experiment: Experiment
+           experiment object to retrieve from the database
+
+        since: `datetime.datetime`, optional
+            Lower bound on the `end_time` of the trials to fetch. Completed trials without an
+            `end_time` are only fetched when `since` is None.
+
+        """
+        raise NotImplementedError()
+
+    def fetch_trial_by_status(self, experiment, status, selection=None):
+        """Fetch all trials with the given status
+
+        .. seealso:: :meth:`fetch_trials` for the meaning of `selection`.
+        """
         raise NotImplementedError()
 
     def count_completed_trials(self, experiment):
         """Count the number of completed trials"""
         raise NotImplementedError()
 
+    def fetch_trials_stats(self, experiment):
+        """Aggregate the results of the completed trials
+
+        Returns
+        -------
+        dict or None
+            None if there are no completed trials, otherwise a dictionary with the number of
+            completed trials `trials_completed`, the latest `end_time` of the completed trials
+            `finish_time`, and the `id`, `objective` and `params` of the best trial as `best_id`,
+            `best_objective` and `best_params`.
+
+        """
+        raise NotImplementedError()
+
     def count_broken_trials(self, experiment):
         """Count the number of broken trials"""
         raise NotImplementedError()
@@ -202,6 +253,22 @@ class BaseStorageProtocol(metaclass=AbstractSingletonType):
         """Update trial's heartbeat"""
         raise NotImplementedError()
 
+    def update_heartbeats(self, trials):
+        """Update the heartbeat of all the given trials which are still reserved
+
+        Parameters
+        ----------
+        trials: list of `Trial` objects
+            Trials to update
+
+        Returns
+        -------
+        list of `Trial` objects
+            Trials which are not reserved anymore and were not updated
+
+        """
+        raise NotImplementedError()
+
 
 # pylint: disable=too-few-public-methods,abstract-method
 class Storage(BaseStorageProtocol, metaclass=SingletonFactory):
@@ -263,6 +330,7 @@ class ReadOnlyStorageProtocol(object):
         'fetch_experiments',
         'count_broken_trials',
         'count_completed_trials',
+        'fetch_trials_stats',
         'fetch_noncompleted_trials',
         'fetch_pending_trials',
         'fetch_lost_trials',
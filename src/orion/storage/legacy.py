@@ -15,7 +15,7 @@ import orion.core
 from orion.core.io.convert import JSONConverter
 from orion.core.io.database import Database, OutdatedDatabaseError
 import orion.core.utils.backward as backward
-from orion.core.worker.trial import Trial
+from orion.core.worker.trial import Trial, TrialView
 from orion.storage.base import BaseStorageProtocol, FailedUpdate, MissingArguments
 
 log = logging.getLogger(__name__)
@@ -112,7 +112,7 @@ class Legacy(BaseStorageProtocol):
         """See :func:`~orion.storage.BaseStorageProtocol.fetch_experiments`"""
         return self._db.read('experiments', query, selection)
 
-    def fetch_trials(self, experiment=None, uid=None):
+    def fetch_trials(self, experiment=None, uid=None, selection=None):
         """See :func:`~orion.storage.BaseStorageProtocol.fetch_trials`"""
         if experiment is not None and uid is not None:
             assert experiment._id == uid
@@ -123,7 +123,7 @@ class Legacy(BaseStorageProtocol):
 
             uid = experiment._id
 
-        return self._fetch_trials(dict(experiment=uid))
+        return self._fetch_trials(dict(experiment=uid), selection)
 
     def _fetch_trials(self, query, selection=None):
         """See :func:`~orion.storage.BaseStorageProtocol.fetch_trials`"""
@@ -133,7 +133,14 @@ class Legacy(BaseStorageProtocol):
                 return 0
             return submit_time
 
-        trials = Trial.build(self._db.read('trials', query=query, selection=selection))
+        if selection is None:
+            trials = Trial.build(self._db.read_iter('trials', query=query))
+        else:
+            # submit_time is always fetched to keep the same ordering as complete trials
+            selection = dict(selection, submit_time=1)
+            trials = [TrialView(document) for document
+                      in self._db.read_iter('trials', query=query, selection=selection)]
+
         trials.sort(key=sort_key)
 
         return trials
@@ -143,6 +150,11 @@ class Legacy(BaseStorageProtocol):
         self._db.write('trials', trial.to_dict())
         return trial
 
+    def register_trials(self, trials):
+        """See :func:`~orion.storage.BaseStorageProtocol.register_trials`"""
+        duplicates = self._db.insert_many('trials', [trial.to_dict() for trial in trials])
+        return [trials[position] for position in duplicates]
+
     def register_lie(self, trial):
         """See :func:`~orion.storage.BaseStorageProtocol.register_lie`"""
         return self._db.write('lying_trials', trial.to_dict())
@@ -280,6 +292,17 @@ class Legacy(BaseStorageProtocol):
         )
         return self._fetch_trials(query)
 
+    def fetch_completed_trials(self, experiment, since=None):
+        """See :func:`~orion.storage.BaseStorageProtocol.fetch_completed_trials`"""
+        query = dict(
+            experiment=experiment._id,
+            status='completed'
+        )
+        if since is not None:
+            query['end_time'] = {'$gte': since}
+
+        return self._fetch_trials(query)
+
     def count_completed_trials(self, experiment):
         """See :func:`~orion.storage.BaseStorageProtocol.count_completed_trials`"""
         query = dict(
@@ -288,6 +311,42 @@ class Legacy(BaseStorageProtocol):
         )
         return self._db.count('trials', query)
 
+    def fetch_trials_stats(self, experiment):
+        """See :func:`~orion.storage.BaseStorageProtocol.fetch_trials_stats`"""
+        query = {'experiment': experiment._id, 'status': 'completed'}
+
+        # Trials are counted before their results get unwound, so that trials without or with
+        # many objectives are counted once.
+        stats = self._db.aggregate('trials', [
+            {'$match': query},
+            {'$group': {
+                '_id': None,
+                'trials_completed': {'$sum': 1},
+                'finish_time': {'$max': '$end_time'}}}
+        ])
+        if not stats:
+            return None
+
+        best = self._db.aggregate('trials', [
+            {'$match': query},
+            {'$unwind': '$results'},
+            {'$match': {'results.type': 'objective'}},
+            {'$group': {
+                '_id': None,
+                # Documents are compared field by field, the objective first.
+                'best': {'$min': {'objective': '$results.value', '_id': '$_id',
+                                  'params': '$params'}}}}
+        ])
+        best = best[0]['best'] if best else dict(objective=None, _id=None, params=None)
+
+        stats = stats[0]
+        stats.pop('_id')
+        stats['best_id'] = best['_id']
+        stats['best_objective'] = best['objective']
+        stats['best_params'] = best['params']
+
+        return stats
+
     def count_broken_trials(self, experiment):
         """See :func:`~orion.storage.BaseStorageProtocol.count_broken_trials`"""
         query = dict(
@@ -300,10 +359,29 @@ class Legacy(BaseStorageProtocol):
         """Update trial's heartbeat"""
         return self._update_trial(trial, heartbeat=datetime.datetime.utcnow(), status='reserved')
 
-    def fetch_trial_by_status(self, experiment, status):
+    def update_heartbeats(self, trials):
+        """See :func:`~orion.storage.BaseStorageProtocol.update_heartbeats`"""
+        if not trials:
+            return []
+
+        query = {
+            '_id': {'$in': [trial.id for trial in trials]},
+            'status': 'reserved'
+        }
+        updated = self._db.write('trials', data={'heartbeat': datetime.datetime.utcnow()},
+                                 query=query)
+        if updated == len(trials):
+            return []
+
+        # Some trials changed status, only then is it necessary to find which ones.
+        reserved = set(document['_id'] for document in
+                       self._db.read('trials', query=query, selection={'_id': 1}))
+        return [trial for trial in trials if trial.id not in reserved]
+
+    def fetch_trial_by_status(self, experiment, status, selection=None):
         """See :func:`~orion.storage.BaseStorageProtocol.fetch_trial_by_status`"""
         query = dict(
             experiment=experiment._id,
             status=status
         )
-        return self._fetch_trials(query)
+        return self._fetch_trials(query, selection)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark latency of :class:`orion.core.worker.producer.Producer` against history size.
+
+Each round of the producer observes the trials completed since last round, observes lies for the
+trials still being evaluated and suggests new trials. The rounds are timed for experiments with
+growing numbers of completed trials.
+
+Usage::
+
+    python tests/benchmarks/bench_producer.py --sizes 100 1000 10000 --algorithm asha
+
+"""
+import argparse
+import datetime
+import os
+import time
+
+import numpy
+
+from orion.core.io.database import Database
+from orion.core.io.database.ephemeraldb import EphemeralDB
+from orion.core.io.experiment_builder import ExperimentBuilder
+from orion.core.utils.format_trials import tuple_to_trial
+from orion.core.worker.producer import Producer
+from orion.storage.base import get_storage, Storage
+from orion.storage.legacy import Legacy
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'functional',
+                      'demo', 'black_box.py')
+
+ALGORITHMS = {
+    'random': ({'random': {'seed': 1}}, ['-x~uniform(-50, 50)']),
+    'asha': ({'asha': {'seed': 1, 'num_brackets': 3}},
+             ['-x~uniform(-50, 50)', '--epochs~fidelity(1, 81, base=3)'])
+}
+
+
+def reset_singletons():
+    """Start each experiment with a new in-memory database"""
+    for singleton in (Storage, Legacy, Database, EphemeralDB):
+        singleton.instance = None
+
+    Storage(of_type='legacy', config={'database': {'type': 'EphemeralDB'}})
+
+
+def build_experiment(algorithm, size, n_pending):
+    """Build an experiment with `size` completed trials and `n_pending` reserved ones"""
+    reset_singletons()
+    algorithms, prior_args = ALGORITHMS[algorithm]
+    experiment = ExperimentBuilder().build_from(
+        {'name': 'bench-{}-{}'.format(algorithm, size), 'algorithms': algorithms,
+         'user_args': [SCRIPT] + prior_args})
+
+    rng = numpy.random.RandomState(1)
+    now = datetime.datetime.utcnow()
+    trials = []
+    # Keep the lowest fidelity so that points are valid in ASHA's first rungs.
+    columns = [[dim.low] * (size + n_pending) if dim.type == 'fidelity' else
+               dim.sample(size + n_pending, seed=rng) for dim in experiment.space.values()]
+    for i, point in enumerate(zip(*columns)):
+        trial = tuple_to_trial(point, experiment.space)
+        trial.experiment = experiment.id
+        trial.submit_time = now
+        if i < size:
+            trial.status = 'completed'
+            # One trial completed per minute, as in an experiment running for a while.
+            trial.end_time = now - datetime.timedelta(minutes=size - i)
+            trial.results = [trial.Result(name='objective', type='objective',
+                                          value=float(rng.normal()))]
+        else:
+            trial.status = 'reserved'
+        trials.append(trial)
+
+    get_storage().register_trials(trials)
+
+    return experiment
+
+
+def benchmark(algorithm, size, n_pending, rounds):
+    """Return the time of the first update and the mean time of the following rounds"""
+    experiment = build_experiment(algorithm, size, n_pending)
+    producer = Producer(experiment)
+
+    start = time.perf_counter()
+    producer.update()
+    first_update = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        producer.update()
+        producer.produce()
+    return first_update, (time.perf_counter() - start) / rounds
+
+
+def main(argv=None):
+    """Run the benchmark and print a table of latencies"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--algorithm', choices=sorted(ALGORITHMS), default='asha')
+    parser.add_argument('--pending', type=int, default=10,
+                        help='number of trials being evaluated, observed as lies')
+    parser.add_argument('--rounds', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    print('{:>10} {:>18} {:>18}'.format('history', 'first update (ms)', 'round (ms)'))
+    for size in args.sizes:
+        first_update, round_time = benchmark(args.algorithm, size, args.pending, args.rounds)
+        print('{:>10} {:>18.2f} {:>18.2f}'.format(size, first_update * 1000, round_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
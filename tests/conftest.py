@@ -31,6 +31,7 @@ class DumbAlgo(BaseAlgorithm):
         self._times_called_is_done = 0
         self._num = 0
         self._index = 0
+        self._suggested = None
         self._points = []
         self._results = []
         self._score_point = None
@@ -462,6 +462,26 @@ def test_worker_trials(database, monkeypatch):
     assert len(list(database.trials.find({'experiment': exp_id}))) == 6
 
 
+@pytest.mark.usefixtures("clean_db")
+@pytest.mark.usefixtures("null_db_instances")
+def test_n_workers(database, monkeypatch):
+    """Test that trials are executed concurrently within a single worker"""
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    orion.core.cli.main(["hunt", "--config", "./orion_config_random.yaml",
+                         "--max-trials", "10", "--n-workers", "3",
+                         "./black_box.py", "-x~uniform(-50, 50)"])
+
+    exp = list(database.experiments.find({'name': 'demo_random_search'}))
+    assert len(exp) == 1
+    exp_id = exp[0]['_id']
+
+    trials = list(database.trials.find({'experiment': exp_id}))
+    assert len(trials) >= 10
+    assert len([trial for trial in trials if trial['status'] == 'completed']) >= 10
+    assert all(trial['status'] in ('completed', 'new') for trial in trials)
+
+
 @pytest.mark.usefixtures("clean_db")
 @pytest.mark.usefixtures("null_db_instances")
 def test_resilience(monkeypatch):
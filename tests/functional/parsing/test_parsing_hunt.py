@@ -27,6 +27,7 @@ def test_hunt_command_full_parsing(database, monkeypatch):
     args_list = ["hunt", "-n", "test",
                  "--config", "./orion_config_random.yaml",
                  "--max-trials", "400", "--pool-size", "4", "--worker-trials", "5",
+                 "--n-workers", "3",
                  "./black_box.py", "-x~normal(1,1)"]
 
     hunt.add_subparser(subparsers)
@@ -39,3 +40,4 @@ def test_hunt_command_full_parsing(database, monkeypatch):
     assert args['pool_size'] == 4
     assert args['max_trials'] == 400
     assert args['worker_trials'] == 5
+    assert args['n_workers'] == 3
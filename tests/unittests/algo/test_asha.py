@@ -409,3 +409,35 @@ class TestASHA():
 
         asha.set_state(state)
         assert point == asha.suggest(1)[0]
+
+    def test_rollback(self, space):
+        """Test that observations made after a snapshot are discarded"""
+        asha = ASHA(space, num_brackets=3)
+        asha.observe([(1, 0.5)], [{'objective': 2.0}])
+        rungs = [[dict(rung) for _, rung in bracket.rungs] for bracket in asha.brackets]
+        trial_info = dict(asha.trial_info)
+
+        snapshot = asha.snapshot()
+        asha.observe([(1, 0.5), (3, 0.5), (1, 0.7), (9, 0.1)],
+                     [{'objective': 1.0}, {'objective': 1.0}, {'objective': 0.0},
+                      {'objective': 0.0}])
+        assert asha.trial_info != trial_info
+
+        asha.rollback(snapshot)
+        assert asha.trial_info == trial_info
+        assert [[rung for _, rung in bracket.rungs] for bracket in asha.brackets] == rungs
+        assert asha._undo_log is None
+
+    def test_nested_rollback(self, asha):
+        """Test that snapshots can be rolled back in reverse order"""
+        first = asha.snapshot()
+        asha.observe([(1, 0.5)], [{'objective': 2.0}])
+        second = asha.snapshot()
+        asha.observe([(1, 0.5)], [{'objective': 1.0}])
+
+        asha.rollback(second)
+        assert asha.brackets[0].rungs[0][1][asha.get_id((1, 0.5))] == (2.0, (1, 0.5))
+
+        asha.rollback(first)
+        assert asha.brackets[0].rungs[0][1] == {}
+        assert asha.trial_info == {}
@@ -69,3 +69,17 @@ def test_space_setter(dumbalgo):
     assert algo.naedw.value == 9
     assert algo.naekei.space == 'etsh'
     assert algo.naekei.judgement == 10
+
+
+def test_rollback(dumbalgo):
+    """Check that observations made after a snapshot are discarded by default."""
+    algo = dumbalgo(8, value=1)
+    algo.observe([(1, 2)], [{'objective': 3}])
+
+    snapshot = algo.snapshot()
+    algo.observe([(2, 3)], [{'objective': 4}])
+    assert algo._points == [(1, 2), (2, 3)]
+
+    algo.rollback(snapshot)
+    assert algo._points == [(1, 2)]
+    assert algo._results == [{'objective': 3}]
@@ -8,9 +8,8 @@ import pytest
 from orion.core.cli.info import (
     format_algorithm, format_commandline, format_config, format_dict, format_identification,
     format_info, format_list, format_metadata, format_refers, format_space, format_stats,
-    format_title, get_trial_params)
+    format_title)
 from orion.core.io.space_builder import SpaceBuilder
-from orion.core.worker.trial import Trial
 
 
 class DummyExperiment():
@@ -19,17 +18,6 @@ class DummyExperiment():
     pass
 
 
-@pytest.fixture
-def dummy_trial():
-    """Return a dummy trial object"""
-    trial = Trial()
-    trial.params = [
-        Trial.Param(name='a', type='real', value=0.0),
-        Trial.Param(name='b', type='integer', value=1),
-        Trial.Param(name='c', type='categorical', value='Some')]
-    return trial
-
-
 @pytest.fixture
 def dummy_dict():
     """Return a dict of dicts"""
@@ -519,34 +507,17 @@ adapter:
 """  # noqa: W291
 
 
-def test_get_trial_params_empty():
-    """Test failing to fetch trials does not fail"""
-    experiment = DummyExperiment()
-    experiment.get_trial = lambda trial=None, uid=None: None
-    assert get_trial_params(None, experiment) == {}
-
-
-def test_get_trial_params(dummy_trial):
-    """Test params are converted properly to a dict."""
-    experiment = DummyExperiment()
-    experiment.get_trial = lambda trial=None, uid=None: dummy_trial
-    params = get_trial_params(None, experiment)
-    assert params['a'] == 0.0
-    assert params['b'] == 1
-    assert params['c'] == 'Some'
-
-
-def test_format_stats(dummy_trial):
+def test_format_stats():
     """Test stats section formatting"""
     experiment = DummyExperiment()
     experiment.stats = dict(
         best_trials_id='dummy',
         trials_completed=10,
         best_evaluation=0.1,
+        best_params={'a': 0.0, 'b': 1, 'c': 'Some'},
         start_time='yesterday',
         finish_time='now',
         duration='way too long')
-    experiment.get_trial = lambda trial=None, uid=None: dummy_trial
     assert format_stats(experiment) == """\
 Stats
 =====
@@ -564,7 +535,7 @@ duration: way too long
 """
 
 
-def test_format_info(algorithm_dict, dummy_trial):
+def test_format_info(algorithm_dict):
     """Test full formatting string"""
     experiment = DummyExperiment()
     commandline = ['executing.sh', '--some~choices(["random", "or", "not"])',
@@ -612,10 +583,10 @@ def test_format_info(algorithm_dict, dummy_trial):
         best_trials_id='dummy',
         trials_completed=10,
         best_evaluation=0.1,
+        best_params={'a': 0.0, 'b': 1, 'c': 'Some'},
         start_time='yesterday',
         finish_time='now',
         duration='way too long')
-    experiment.get_trial = lambda trial=None, uid=None: dummy_trial
 
     assert format_info(experiment) == """\
 Identification
@@ -97,6 +97,18 @@ def test_set_int_value():
     assert "<class 'int'> cannot be set to voici_voila with type <class 'str'>" in str(exc.value)
 
 
+def test_unset_value():
+    """Test that an option with a default of None is not converted"""
+    config = Configuration()
+    config.add_option('test', option_type=int, default=None)
+
+    assert config.test is None
+    config.test = "2"
+    assert config.test == 2
+    config.test = None
+    assert config.test is None
+
+
 def test_set_real_value():
     """Test that a float option can have its value set"""
     config = Configuration()
@@ -10,6 +10,7 @@ import pymongo
 from pymongo import MongoClient
 import pytest
 
+import orion.core
 from orion.core.io.database import Database, DatabaseError, DuplicateKeyError
 from orion.core.io.database.mongodb import AUTH_FAILED_MESSAGES, MongoDB
 
@@ -106,6 +107,47 @@ class TestConnection(object):
         assert orion_db.password == 'none'
         assert orion_db.name == 'orion'
 
+    def test_client_options(self, monkeypatch):
+        """Check that client options are passed to the client."""
+        monkeypatch.setattr(MongoDB, 'initiate_connection', lambda self: None)
+
+        orion_db = MongoDB('mongodb://localhost', name='orion', max_pool_size=10,
+                           write_concern='majority', read_preference='secondaryPreferred',
+                           batch_size=50)
+        assert orion_db.options['maxPoolSize'] == 10
+        assert orion_db.options['w'] == 'majority'
+        assert orion_db.options['readPreference'] == 'secondaryPreferred'
+        assert orion_db.batch_size == 50
+
+    def test_client_options_from_config(self, monkeypatch):
+        """Check that client options default to the database configuration."""
+        monkeypatch.setattr(MongoDB, 'initiate_connection', lambda self: None)
+        monkeypatch.setattr(orion.core.config.database, 'max_pool_size', 5)
+        monkeypatch.setattr(orion.core.config.database, 'write_concern', '2')
+        monkeypatch.setattr(orion.core.config.database, 'batch_size', 20)
+
+        orion_db = MongoDB('mongodb://localhost', name='orion')
+        assert orion_db.options['maxPoolSize'] == 5
+        assert orion_db.options['w'] == 2
+        assert 'readPreference' not in orion_db.options
+        assert orion_db.batch_size == 20
+
+    def test_client_options_from_uri(self, monkeypatch):
+        """Check that options of the URI are not overridden when not set."""
+        monkeypatch.setattr(MongoDB, 'initiate_connection', lambda self: None)
+
+        uri = ('mongodb://localhost/?w=majority&readPreference=secondaryPreferred'
+               '&maxPoolSize=7')
+        orion_db = MongoDB(uri, name='orion')
+        for option in ('maxPoolSize', 'w', 'readPreference'):
+            assert option not in orion_db.options
+
+        client = MongoClient(uri, connect=False, **orion_db.options)
+        assert client.max_pool_size == 7
+        assert client.write_concern.document == {'w': 'majority'}
+        assert client.read_preference.mongos_mode == 'secondaryPreferred'
+        client.close()
+
     def test_singleton(self):
         """Test that MongoDB class is a singleton."""
         orion_db = MongoDB('mongodb://localhost',
@@ -259,6 +301,13 @@ class TestRead(object):
             selection={'algorithms': 1, '_id': 0})
         assert value == [{'algorithms': exp_config[0][0]['algorithms']}]
 
+    def test_read_iter(self, exp_config, orion_db, monkeypatch):
+        """Iterate over entries fetched in batches."""
+        monkeypatch.setattr(orion_db, 'batch_size', 2)
+        documents = orion_db.read_iter('trials', {'experiment': 'supernaedo2-dendi'})
+        assert not isinstance(documents, list)
+        assert list(documents) == orion_db.read('trials', {'experiment': 'supernaedo2-dendi'})
+
     def test_read_nothing(self, orion_db):
         """Fetch value(s) from an entry."""
         value = orion_db.read(
@@ -3,6 +3,7 @@
 """Collection of tests for :mod:`orion.core.io.database.ephemeraldb`."""
 
 from datetime import datetime
+import timeit
 
 import pytest
 
@@ -226,6 +227,34 @@ class TestWrite(object):
         assert 'unique_field' in str(exc.value)
 
 
+@pytest.mark.usefixtures("clean_db")
+class TestInsertMany(object):
+    """Calls to :meth:`orion.core.io.database.ephemeraldb.EphemeralDB.insert_many`."""
+
+    def test_insert_many(self, database, orion_db):
+        """Should insert all documents and report no duplicates."""
+        item = [{'exp_name': 'supernaekei2',
+                 'user': 'tsirif'},
+                {'exp_name': 'supernaekei3',
+                 'user': 'tsirif'}]
+        count_before = database['experiments'].count()
+        # call interface
+        assert orion_db.insert_many('experiments', item) == []
+        assert database['experiments'].count() == count_before + 2
+
+    def test_insert_many_with_duplicates(self, database, orion_db):
+        """Should insert all documents except duplicates and report their positions."""
+        orion_db.ensure_index('new_collection', 'exp_name', unique=True)
+        item = [{'exp_name': 'supernaekei2'},
+                {'exp_name': 'supernaekei2'},
+                {'exp_name': 'supernaekei3'}]
+        count_before = database['new_collection'].count()
+        # call interface
+        assert orion_db.insert_many('new_collection', item) == [1]
+        assert database['new_collection'].count() == count_before + 2
+        assert database['new_collection'].count({'exp_name': 'supernaekei3'}) == 1
+
+
 @pytest.mark.usefixtures("clean_db")
 class TestReadAndWrite(object):
     """Calls to :meth:`orion.core.io.database.ephemeraldb.EphemeralDB.read_and_write`."""
@@ -327,6 +356,60 @@ class TestCount(object):
         assert found == 0
 
 
+@pytest.mark.usefixtures("clean_db")
+class TestAggregate(object):
+    """Calls :meth:`orion.core.io.database.ephemeraldb.EphemeralDB.aggregate`."""
+
+    def test_group_all(self, exp_config, orion_db):
+        """Accumulate values over all documents."""
+        result = orion_db.aggregate('trials', [
+            {'$group': {'_id': None, 'count': {'$sum': 1},
+                        'first_submit': {'$min': '$submit_time'},
+                        'last_submit': {'$max': '$submit_time'}}}])
+
+        submit_times = [trial['submit_time'] for trial in exp_config[1]]
+        assert result == [{'_id': None, 'count': len(exp_config[1]),
+                           'first_submit': min(submit_times), 'last_submit': max(submit_times)}]
+
+    def test_group_by_key(self, exp_config, orion_db):
+        """Accumulate values of each group of documents."""
+        result = orion_db.aggregate('trials', [
+            {'$match': {'experiment': 'supernaedo2-dendi'}},
+            {'$group': {'_id': '$status', 'count': {'$sum': 1}}}])
+
+        trials = [trial for trial in exp_config[1] if trial['experiment'] == 'supernaedo2-dendi']
+        assert len(result) == len(set(trial['status'] for trial in trials))
+        for group in result:
+            assert group['count'] == len([trial for trial in trials
+                                          if trial['status'] == group['_id']])
+
+    def test_unwind(self, exp_config, orion_db):
+        """Unwound arrays should produce one document per element."""
+        result = orion_db.aggregate('trials', [
+            {'$match': {'status': 'completed'}},
+            {'$unwind': '$results'},
+            {'$match': {'results.type': 'objective'}},
+            {'$group': {'_id': None,
+                        'count': {'$sum': 1},
+                        'best': {'$min': {'objective': '$results.value', '_id': '$_id'}}}}])
+
+        assert result == [{'_id': None, 'count': 4,
+                           'best': {'objective': 2, '_id': exp_config[1][2]['_id']}}]
+
+    def test_nothing(self, orion_db):
+        """No groups should be returned when nothing matches."""
+        assert orion_db.aggregate('trials', [
+            {'$match': {'status': 'lalalanotfound'}},
+            {'$group': {'_id': None, 'count': {'$sum': 1}}}]) == []
+
+    def test_unsupported_stage(self, orion_db):
+        """Stages not implemented by EphemeralDB should raise ValueError."""
+        with pytest.raises(ValueError) as exc:
+            orion_db.aggregate('trials', [{'$sort': {'submit_time': 1}}])
+
+        assert "'$sort' is not supported" in str(exc.value)
+
+
 @pytest.mark.usefixtures("clean_db")
 class TestIndex(object):
     """Test index for :meth:`orion.core.io.database.ephemeraldb.EphemeralCollection`."""
@@ -367,6 +450,150 @@ class TestIndex(object):
              {'_id': 3, 'hello': 2, 'idontexist': None}])
 
 
+class TestNewId(object):
+    """Test id allocation of :meth:`orion.core.io.database.ephemeraldb.EphemeralCollection`."""
+
+    def test_ids_are_not_reused(self, collection):
+        """Ids of deleted documents should not be assigned again"""
+        collection.insert_many([{'hello': 'here'}])
+        collection.delete_many({'hello': 'here'})
+        collection.insert_many([{'hello': 'again'}])
+        assert collection.find({'hello': 'again'}, {'_id': 1}) == [{'_id': 3}]
+
+    def test_ids_after_explicit_id(self, collection):
+        """Ids should be assigned after the largest explicit integer id"""
+        collection.insert_many([{'_id': 10}, {'_id': 'abc'}, {'hello': 'here'}])
+        assert collection.find({'hello': 'here'}, {'_id': 1}) == [{'_id': 11}]
+
+    def test_restore_counter(self, collection):
+        """Counter should be rebuilt for collections pickled without one"""
+        collection.insert_many([{'_id': 10}])
+        state = dict(collection.__dict__)
+        state.pop('_next_id')
+
+        restored_collection = EphemeralCollection.__new__(EphemeralCollection)
+        restored_collection.__setstate__(state)
+        restored_collection.insert_many([{'hello': 'here'}])
+        assert restored_collection.find({'hello': 'here'}, {'_id': 1}) == [{'_id': 11}]
+
+    def test_insert_many_linear_time(self):
+        """Micro-benchmark: inserting 100k documents should take linear time"""
+        def insert(n_documents):
+            collection = EphemeralCollection()
+            collection.insert_many([{'value': i} for i in range(n_documents)])
+
+        small = min(timeit.repeat(lambda: insert(10000), number=1, repeat=3))
+        large = min(timeit.repeat(lambda: insert(100000), number=1, repeat=1))
+
+        # Quadratic insertion would be ~100 times slower
+        assert large / small < 30
+
+
+class TestQueryIndex(object):
+    """Test query planning with indexes of
+    :meth:`orion.core.io.database.ephemeraldb.EphemeralCollection`.
+    """
+
+    @pytest.fixture()
+    def collection(self):
+        """Return EphemeralCollection with indexed documents."""
+        collection = EphemeralCollection()
+        collection.create_index('status')
+        collection.create_index('end_time')
+        collection.insert_many([
+            {'status': ['new', 'completed'][i % 2], 'end_time': i if i % 2 else None,
+             'results': [{'value': i}]}
+            for i in range(20)])
+        collection.create_index('results')
+
+        return collection
+
+    def test_non_unique_index_created(self, collection):
+        """Non unique indexes should be used for queries but not enforced"""
+        assert collection.index_information() == {'_id_': True, 'status_1': False,
+                                                  'end_time_1': False, 'results_1': False}
+        collection.insert_many([{'status': 'new'}])
+        assert collection.count({'status': 'new'}) == 11
+
+    def test_equality_candidates(self, collection):
+        """Only documents with the same value should be candidates"""
+        candidates = collection._get_candidates({'status': 'completed'})
+        assert len(candidates) == 10
+        assert [document['_id'] for document in candidates] == list(range(2, 21, 2))
+
+    def test_in_candidates(self, collection):
+        """Only documents with one of the values should be candidates"""
+        assert len(collection._get_candidates({'status': {'$in': ['new', 'broken']}})) == 10
+        assert len(collection._get_candidates({'_id': {'$in': [1, 2, 25]}})) == 2
+
+    def test_range_candidates(self, collection):
+        """Only documents within the range should be candidates"""
+        assert len(collection._get_candidates({'end_time': {'$gte': 15}})) == 3
+        assert len(collection._get_candidates({'end_time': {'$gt': 15}})) == 2
+        assert len(collection._get_candidates({'end_time': {'$lte': 5}})) == 3
+        assert len(collection._get_candidates({'end_time': {'$gte': 5, '$lte': 9}})) == 3
+
+    def test_intersect_candidates(self, collection):
+        """Candidates should satisfy all indexes covering the query"""
+        assert len(collection._get_candidates({'status': 'new', '_id': {'$in': [1, 2]}})) == 1
+
+    def test_full_scan(self, collection):
+        """All documents should be candidates if no index covers the query"""
+        assert len(collection._get_candidates({'other': 1})) == 20
+        assert len(collection._get_candidates({'status': {'$ne': 'new'}})) == 20
+
+    def test_unhashable_values(self, collection):
+        """Documents with unhashable values should always be candidates"""
+        assert len(collection._get_candidates({'results': [{'value': 1}]})) == 20
+        assert collection.find({'results': [{'value': 1}]}, {'_id': 1}) == [{'_id': 2}]
+
+    def test_results_order(self, collection):
+        """Results found with indexes should be in order of insertion"""
+        collection.update_many({'_id': 3}, {'$set': {'end_time': 100}})
+        assert ([document['_id'] for document in collection.find({'end_time': {'$gte': 15}})] ==
+                [3, 16, 18, 20])
+
+    def test_update_reindex(self, collection):
+        """Updated documents should be moved in indexes"""
+        assert collection.update_many({'status': 'new'}, {'$set': {'status': 'reserved'}}) == 10
+        assert collection.count({'status': 'new'}) == 0
+        assert len(collection._get_candidates({'status': 'new'})) == 0
+        assert len(collection._get_candidates({'status': 'reserved'})) == 10
+
+    def test_delete_unindex(self, collection):
+        """Deleted documents should be removed from indexes"""
+        assert collection.delete_many({'status': 'new'}) == 10
+        assert len(collection._get_candidates({'status': {'$in': ['new', 'completed']}})) == 10
+
+    def test_query_time_scales_with_results(self):
+        """Micro-benchmark: querying 10 documents should not depend on the size of the buckets"""
+        def build(n_documents):
+            collection = EphemeralCollection()
+            collection.create_index('experiment')
+            collection.create_index('status')
+            collection.insert_many([{'experiment': 1, 'status': 'new' if i < 10 else 'completed'}
+                                    for i in range(n_documents)])
+            return collection
+
+        small = build(10000)
+        large = build(100000)
+
+        def query(collection):
+            assert len(collection.find({'experiment': 1, 'status': 'new'})) == 10
+
+        small_time = min(timeit.repeat(lambda: query(small), number=10, repeat=3))
+        large_time = min(timeit.repeat(lambda: query(large), number=10, repeat=3))
+
+        # Copying the buckets would be ~10 times slower
+        assert large_time / small_time < 3
+
+    def test_drop_non_unique_index(self, collection):
+        """Non unique indexes should be dropped"""
+        collection.drop_index('status_1')
+        assert 'status_1' not in collection.index_information()
+        assert len(collection._get_candidates({'status': 'new'})) == 20
+
+
 @pytest.mark.usefixtures("clean_db")
 class TestSelect(object):
     """Calls :meth:`orion.core.io.database.ephemeraldb.EphemeralDocument.select`."""
@@ -469,10 +696,10 @@ class TestIndexInformation(object):
         assert orion_db.index_information('experiments') == {'_id_': True}
 
     def test_single_index(self, orion_db):
-        """Test that single indexes are ignored if not unique."""
+        """Test that single indexes are reported as not unique."""
         orion_db.ensure_index('experiments', [('name', EphemeralDB.ASCENDING)])
 
-        assert orion_db.index_information('experiments') == {'_id_': True}
+        assert orion_db.index_information('experiments') == {'_id_': True, 'name_1': False}
 
     def test_single_index_unique(self, orion_db):
         """Test with single unique indexes."""
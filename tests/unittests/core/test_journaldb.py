@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Collection of tests for :mod:`orion.core.io.database.journaldb`."""
+from datetime import datetime
+from multiprocessing import Pool
+import os
+
+import pytest
+
+from orion.core.io.database import Database, DuplicateKeyError
+from orion.core.io.database.journaldb import _frame, _iter_records, JournalDB
+
+
+def new_journal_db(host, **kwargs):
+    """Return a new JournalDB instance, as if created in another worker."""
+    JournalDB.instance = None
+    return JournalDB(host=host, **kwargs)
+
+
+@pytest.fixture()
+def orion_db(tmpdir):
+    """Return JournalDB wrapper instance initiated with test opts."""
+    orion_db = new_journal_db(os.path.join(str(tmpdir), 'orion_db.journal'))
+    yield orion_db
+    orion_db.close_connection()
+    JournalDB.instance = None
+
+
+@pytest.fixture()
+def clean_db(orion_db, exp_config):
+    """Clean insert example experiment entries to collections."""
+    orion_db.write('experiments', exp_config[0])
+    orion_db.write('trials', exp_config[1])
+    orion_db.write('workers', exp_config[2])
+    orion_db.write('resources', exp_config[3])
+
+
+@pytest.mark.usefixtures("clean_db")
+class TestEnsureIndex(object):
+    """Calls to :meth:`orion.core.io.database.journaldb.JournalDB.ensure_index`."""
+
+    def test_new_index(self, orion_db):
+        """Index should be replayed by other workers"""
+        orion_db.ensure_index('new_collection', 'new_field', unique=True)
+        assert "new_field_1" in orion_db.index_information('new_collection')
+
+        other_db = new_journal_db(orion_db.host)
+        assert "new_field_1" in other_db.index_information('new_collection')
+
+    def test_compound_index(self, orion_db):
+        """Tuple of Index should be added as a compound index."""
+        orion_db.ensure_index('experiments',
+                              [('name', Database.ASCENDING),
+                               ('metadata.user', Database.ASCENDING)], unique=True)
+
+        other_db = new_journal_db(orion_db.host)
+        assert "name_1_metadata.user_1" in other_db.index_information('experiments')
+
+    def test_drop_index(self, orion_db):
+        """Dropped index should be replayed by other workers"""
+        orion_db.ensure_index('new_collection', 'new_field', unique=True)
+        orion_db.drop_index('new_collection', 'new_field_1')
+
+        other_db = new_journal_db(orion_db.host)
+        assert "new_field_1" not in other_db.index_information('new_collection')
+
+
+@pytest.mark.usefixtures("clean_db")
+class TestRead(object):
+    """Calls to :meth:`orion.core.io.database.journaldb.JournalDB.read`."""
+
+    def test_read_experiment(self, exp_config, orion_db):
+        """Fetch a whole experiment entries."""
+        loaded_config = orion_db.read(
+            'trials', {'experiment': 'supernaedo2-dendi', 'status': 'new'})
+        assert loaded_config == [exp_config[1][3], exp_config[1][4]]
+
+    def test_read_default(self, exp_config, orion_db):
+        """Fetch value(s) from an entry."""
+        value = orion_db.read(
+            'experiments', {'name': 'supernaedo2', 'metadata.user': 'tsirif'},
+            selection={'algorithms': 1, '_id': 0})
+        assert value == [{'algorithms': exp_config[0][0]['algorithms']}]
+
+    def test_read_trials(self, exp_config, orion_db):
+        """Fetch value(s) from an entry replayed from the journal."""
+        other_db = new_journal_db(orion_db.host)
+        value = other_db.read(
+            'trials',
+            {'experiment': 'supernaedo2-dendi',
+             'submit_time': {'$gte': datetime(2017, 11, 23, 0, 0, 0)}})
+        assert value == [exp_config[1][1]] + exp_config[1][3:7]
+
+
+@pytest.mark.usefixtures("clean_db")
+class TestWrite(object):
+    """Calls to :meth:`orion.core.io.database.journaldb.JournalDB.write`."""
+
+    def test_insert_many(self, orion_db):
+        """Should insert two new entry (as a list) visible from other workers."""
+        item = [{'exp_name': 'supernaekei2',
+                 'user': 'tsirif'},
+                {'exp_name': 'supernaekei3',
+                 'user': 'tsirif'}]
+        count_before = orion_db.count('experiments')
+        # call interface
+        assert orion_db.write('experiments', item) == 2
+
+        other_db = new_journal_db(orion_db.host)
+        assert other_db.count('experiments') == count_before + 2
+        assert other_db.read('experiments', {'exp_name': 'supernaekei2'}) == [item[0]]
+        assert other_db.read('experiments', {'exp_name': 'supernaekei3'}) == [item[1]]
+
+    def test_insert_duplicate_in_batch(self, orion_db):
+        """Documents inserted before a DuplicateKeyError should be journaled."""
+        orion_db.ensure_index('new_collection', 'unique', unique=True)
+
+        with pytest.raises(DuplicateKeyError):
+            orion_db.write('new_collection', [{'unique': 1}, {'unique': 2}, {'unique': 1}])
+
+        other_db = new_journal_db(orion_db.host)
+        assert other_db.count('new_collection') == 2
+
+    def test_insert_many_with_duplicates(self, orion_db):
+        """Only documents inserted without duplicates should be journaled."""
+        orion_db.ensure_index('new_collection', 'unique', unique=True)
+
+        assert orion_db.insert_many(
+            'new_collection', [{'unique': 1}, {'unique': 2}, {'unique': 1}]) == [2]
+
+        other_db = new_journal_db(orion_db.host)
+        assert other_db.count('new_collection') == 2
+
+    def test_update_many_default(self, orion_db):
+        """Should match existing entries, and update some of their keys."""
+        filt = {'metadata.user': 'dendi'}
+        count_query = orion_db.count('experiments', filt)
+        # call interface
+        assert orion_db.write('experiments', {'pool_size': 16}, filt) == count_query
+
+        other_db = new_journal_db(orion_db.host)
+        value = other_db.read('experiments')
+        assert value[0]['pool_size'] == 16
+        assert value[1]['pool_size'] == 2
+
+    def test_write_is_replayed_incrementally(self, orion_db):
+        """Workers should see writes of other workers without reloading the journal."""
+        other_db = new_journal_db(orion_db.host)
+        count_before = other_db.count('experiments')
+
+        orion_db.write('experiments', {'exp_name': 'supernaekei'})
+
+        assert other_db.count('experiments') == count_before + 1
+        assert other_db.read('experiments', {'exp_name': 'supernaekei'})[0]['_id'] == \
+            orion_db.read('experiments', {'exp_name': 'supernaekei'})[0]['_id']
+
+
+@pytest.mark.usefixtures("clean_db")
+class TestReadAndWrite(object):
+    """Calls to :meth:`orion.core.io.database.journaldb.JournalDB.read_and_write`."""
+
+    def test_read_and_write_one(self, orion_db, exp_config):
+        """Should read and update a single entry in the collection."""
+        loaded_config = orion_db.read_and_write(
+            'experiments',
+            {'name': 'supernaedo4'},
+            {'pool_size': 'lalala'})
+        exp_config[0][3]['pool_size'] = 'lalala'
+        assert loaded_config == exp_config[0][3]
+
+        other_db = new_journal_db(orion_db.host)
+        assert other_db.read('experiments', {'name': 'supernaedo4'}) == [exp_config[0][3]]
+
+    def test_read_and_write_no_match(self, orion_db):
+        """Should return None when there is no match."""
+        loaded_config = orion_db.read_and_write(
+            'experiments',
+            {'name': 'lalala'},
+            {'pool_size': 'lalala'})
+
+        assert loaded_config is None
+
+
+@pytest.mark.usefixtures("clean_db")
+class TestRemove(object):
+    """Calls to :meth:`orion.core.io.database.journaldb.JournalDB.remove`."""
+
+    def test_remove_many_default(self, exp_config, orion_db):
+        """Should match existing entries, and delete them all."""
+        filt = {'metadata.user': 'tsirif'}
+        count_filt = orion_db.count('experiments', filt)
+        # call interface
+        assert orion_db.remove('experiments', filt) == count_filt
+
+        other_db = new_journal_db(orion_db.host)
+        assert other_db.read('experiments') == [exp_config[0][0]]
+
+
+@pytest.mark.usefixtures("clean_db")
+class TestCompaction(object):
+    """Calls to :meth:`orion.core.io.database.journaldb.JournalDB.compact`."""
+
+    def test_compact(self, exp_config, orion_db):
+        """Compacted journal should contain the same database"""
+        orion_db.write('experiments', {'pool_size': 16}, {'metadata.user': 'dendi'})
+        orion_db.compact()
+
+        with open(orion_db.host, 'rb') as journal:
+            records = [record for record, _ in _iter_records(journal)]
+        assert [operation for operation, _ in records] == ['snapshot']
+        assert orion_db._n_records == 0
+
+        other_db = new_journal_db(orion_db.host)
+        assert other_db.count('trials') == len(exp_config[1])
+        assert other_db.read('experiments') == orion_db.read('experiments')
+
+    def test_compaction_in_other_worker(self, orion_db):
+        """Workers should reload the journal once compacted by another worker"""
+        other_db = new_journal_db(orion_db.host)
+        count_before = other_db.count('experiments')
+
+        orion_db.compact()
+        orion_db.write('experiments', {'exp_name': 'supernaekei'})
+
+        assert other_db.count('experiments') == count_before + 1
+
+    def test_background_compaction(self, orion_db):
+        """Compaction should be triggered when the threshold is reached"""
+        orion_db.compaction_threshold = orion_db._n_records + 2
+        orion_db.write('experiments', {'exp_name': 'supernaekei'})
+        assert orion_db._compaction is None
+
+        orion_db.write('experiments', {'exp_name': 'supernaekei2'})
+        orion_db._compaction.join()
+        assert orion_db._n_records == 0
+
+        other_db = new_journal_db(orion_db.host)
+        assert other_db.count('experiments', {'exp_name': 'supernaekei2'}) == 1
+
+
+@pytest.mark.usefixtures("clean_db")
+def test_incomplete_record(orion_db):
+    """Incomplete records being appended should be ignored, and overwritten if never completed"""
+    with open(orion_db.host, 'ab') as f:
+        f.write(_frame(('remove', ('experiments', {})))[:-1])
+
+    other_db = new_journal_db(orion_db.host)
+    count = other_db.count('experiments')
+    assert count > 0
+
+    orion_db.write('experiments', {'exp_name': 'supernaekei'})
+    assert other_db.count('experiments') == count + 1
+
+
+def write(host, field, i):
+    """Write the given value to the journaled db."""
+    orion_db = new_journal_db(host)
+    try:
+        orion_db.write('concurrent', {field: i})
+    except DuplicateKeyError:
+        print('dup')
+        pass
+
+    print(field, i)
+
+
+class TestConcurreny(object):
+    """Test concurrent operations"""
+
+    def test_concurrent_writes(self, orion_db):
+        """Test that concurrent writes all get written properly"""
+        orion_db.ensure_index('concurrent', 'diff')
+
+        assert orion_db.count('concurrent', {'diff': {'$gt': -1}}) == 0
+
+        Pool(10).starmap(write, ((orion_db.host, 'diff', i) for i in range(10)))
+
+        assert orion_db.count('concurrent', {'diff': {'$gt': -1}}) == 10
+        ids = [document['_id'] for document in orion_db.read('concurrent')]
+        assert len(set(ids)) == 10
+
+    def test_concurrent_unique_writes(self, orion_db):
+        """Test that concurrent writes cannot duplicate unique fields"""
+        orion_db.ensure_index('concurrent', 'unique', unique=True)
+
+        assert orion_db.count('concurrent', {'unique': 1}) == 0
+
+        Pool(10).starmap(write, ((orion_db.host, 'unique', 1) for i in range(10)))
+
+        assert orion_db.count('concurrent', {'unique': 1}) == 1
@@ -202,6 +202,24 @@ class TestWrite(object):
         assert value[2]['pool_size'] == 2
 
 
+@pytest.mark.usefixtures("clean_db")
+class TestInsertMany(object):
+    """Calls to :meth:`orion.core.io.database.pickleddb.PickledDB.insert_many`."""
+
+    def test_insert_many_with_duplicates(self, orion_db):
+        """Should insert all documents except duplicates and report their positions."""
+        orion_db.ensure_index('new_collection', 'exp_name', unique=True)
+        item = [{'exp_name': 'supernaekei2'},
+                {'exp_name': 'supernaekei2'},
+                {'exp_name': 'supernaekei3'}]
+        count_before = orion_db._get_database().count('new_collection')
+        # call interface
+        assert orion_db.insert_many('new_collection', item) == [1]
+        database = orion_db._get_database()._db
+        assert database['new_collection'].count() == count_before + 2
+        assert database['new_collection'].count({'exp_name': 'supernaekei3'}) == 1
+
+
 @pytest.mark.usefixtures("clean_db")
 class TestReadAndWrite(object):
     """Calls to :meth:`orion.core.io.database.pickleddb.PickledDB.read_and_write`."""
@@ -318,6 +336,21 @@ class TestCount(object):
         assert found == 0
 
 
+@pytest.mark.usefixtures("clean_db")
+class TestAggregate(object):
+    """Calls :meth:`orion.core.io.database.pickleddb.PickledDB.aggregate`."""
+
+    def test_group_by_key(self, exp_config, orion_db):
+        """Accumulate values of each group of documents."""
+        result = orion_db.aggregate('trials', [
+            {'$match': {'status': {'$in': ['new', 'completed']}}},
+            {'$group': {'_id': '$status', 'count': {'$sum': 1}}}])
+
+        counts = dict((group['_id'], group['count']) for group in result)
+        for status in ['new', 'completed']:
+            assert counts[status] == len([x for x in exp_config[1] if x['status'] == status])
+
+
 def write(field, i):
     """Write the given value to the pickled db."""
     PickledDB.instance = None
@@ -7,6 +7,8 @@ import time
 
 import pytest
 
+from orion.core.io.space_builder import SpaceBuilder
+from orion.core.worker import producer as producer_module
 from orion.core.worker.producer import Producer
 from orion.core.worker.trial import Trial
 
@@ -126,17 +128,110 @@ def test_strategist_observe_completed(producer):
         }
 
 
-def test_naive_algorithm_is_producing(monkeypatch, producer, database, random_dt):
-    """Verify naive algo is used to produce, not original algo"""
+def test_update_only_fetches_newly_completed_trials(producer, monkeypatch):
+    """Test that completed trials are fetched incrementally and observed only once"""
+    fetch_completed_trials = producer.experiment.fetch_completed_trials
+    cursors = []
+
+    def spy(since=None):
+        cursors.append(since)
+        return fetch_completed_trials(since=since)
+
+    monkeypatch.setattr(producer.experiment, 'fetch_completed_trials', spy)
+
+    producer.update()
+    last_end_time = max(trial.end_time
+                        for trial in producer.experiment.fetch_trials_by_status('completed'))
+    assert producer._last_end_time == last_end_time
+
+    producer.update()
+    assert cursors == [None, last_end_time - producer.completion_margin]
+    assert len(producer.algorithm.algorithm._points) == 3
+
+
+class StubExperiment(object):
+    """Experiment with completed trials kept in memory"""
+
+    def __init__(self, algorithm):
+        self.space = algorithm.space
+        self.algorithms = algorithm
+        self.producer = {'strategy': DumbParallelStrategy()}
+        self.pool_size = 1
+        self.trials = []
+        self.cursors = []
+
+    def complete_trial(self, x, end_time):
+        """Add a completed trial"""
+        self.trials.append(Trial(
+            experiment='stub', status='completed', end_time=end_time,
+            params=[dict(name='/x', type='real', value=x)],
+            results=[dict(name='objective', type='objective', value=x)]))
+
+    def fetch_completed_trials(self, since=None):
+        """Return trials completed since given time"""
+        self.cursors.append(since)
+        return [trial for trial in self.trials if since is None or trial.end_time >= since]
+
+    def fetch_noncompleted_trials(self):
+        """Return no trials"""
+        return []
+
+
+def test_late_trials_are_observed_on_resync(dumbalgo, caplog):
+    """Test that trials written later than the completion margin are observed on resync"""
+    space = SpaceBuilder().build_from(['-x~uniform(0, 10)'])
+    experiment = StubExperiment(dumbalgo(space))
+    now = datetime.datetime.utcnow()
+    experiment.complete_trial(1.0, now)
+
+    producer = Producer(experiment, completion_margin=60, resync_interval=3600)
+    producer.update()
+    assert len(experiment.algorithms._points) == 1
+
+    # Written late by a worker whose clock is two minutes behind
+    experiment.complete_trial(2.0, now - datetime.timedelta(minutes=2))
+    producer.update()
+    assert experiment.cursors[-1] == now - datetime.timedelta(seconds=60)
+    assert len(experiment.algorithms._points) == 1
+
+    producer.resync_interval = 0
+    producer.update()
+    assert experiment.cursors[-1] is None
+    assert experiment.algorithms._points == [(1.0, ), (2.0, )]
+    assert 'worker.completion_margin' in caplog.text
+
+    # Trials already observed are not observed again
+    producer.update()
+    assert len(experiment.algorithms._points) == 2
+
+
+def test_backoff_waits(dumbalgo, monkeypatch):
+    """Test that backoff waits about a second, bounded by the maximum wait given"""
+    space = SpaceBuilder().build_from(['-x~uniform(0, 10)'])
+    producer = Producer(StubExperiment(dumbalgo(space)))
+    waits = []
+    monkeypatch.setattr(producer_module.time, 'sleep', waits.append)
+
+    producer.backoff()
+    producer.backoff(max_wait=0.1)
+    producer.backoff(max_wait=-1)
+
+    assert 0 < waits[0] < 2
+    assert waits[1:] == [0.1, 0]
+
+
+def test_naive_algorithm_is_producing(producer, database, random_dt):
+    """Verify naive algo is the original algo observing the lies"""
     producer.experiment.pool_size = 1
     producer.algorithm.algorithm.possible_values = [('gru', 'rnn')]
     producer.update()
-    monkeypatch.setattr(producer.algorithm.algorithm, 'set_state', lambda value: None)
+    assert producer.naive_algorithm is producer.algorithm
+    assert len(producer.algorithm.algorithm._points) == (3 + 4)
+
     producer.algorithm.algorithm.possible_values = [('gru', 'gru')]
     producer.produce()
 
     assert producer.naive_algorithm.algorithm._num == 1  # pool size
-    assert producer.algorithm.algorithm._num == 0
 
 
 def test_update_and_produce(producer, database, random_dt):
@@ -354,35 +449,32 @@ def test_naive_algo_trained_on_all_non_completed_trials(producer, database, rand
     producer.update()
     assert len(produce_lies(producer)) == 6
 
-    assert len(producer.algorithm.algorithm._points) == 1
     assert len(producer.naive_algorithm.algorithm._points) == (1 + 6)
 
+    producer._discard_lies()
+    assert len(producer.algorithm.algorithm._points) == 1
 
-def test_naive_algo_is_discared(producer, database, monkeypatch):
-    """Verify that naive algo is discarded and recopied from original algo"""
+
+def test_lies_are_discarded(producer, database, monkeypatch):
+    """Verify that lies are rolled back before observing new completed trials"""
     # Set values for predictions
     producer.experiment.pool_size = 1
     producer.experiment.algorithms.algorithm.possible_values = [('gru', 'rnn')]
 
     producer.update()
     assert len(produce_lies(producer)) == 4
-
-    first_naive_algorithm = producer.naive_algorithm
-
-    assert len(producer.algorithm.algorithm._points) == 3
-    assert len(first_naive_algorithm.algorithm._points) == (3 + 4)
+    assert len(producer.algorithm.algorithm._points) == (3 + 4)
 
     producer.produce()
+    assert producer.algorithm.algorithm._num == 1
 
-    # Only update the original algo, naive algo is still not discarded
+    # Lies are discarded, but the state of the algorithm keeps evolving.
     update_algorithm(producer)
     assert len(producer.algorithm.algorithm._points) == 3
-    assert first_naive_algorithm == producer.naive_algorithm
-    assert len(producer.naive_algorithm.algorithm._points) == (3 + 4)
+    assert producer.algorithm.algorithm._num == 1
 
-    # Discard naive algo and create a new one, now trained on 5 points.
+    # Observe lies again, now on 5 non completed trials.
     update_naive_algorithm(producer)
-    assert first_naive_algorithm != producer.naive_algorithm
     assert len(producer.naive_algorithm.algorithm._points) == (3 + 5)
 
 
@@ -616,10 +708,9 @@ def test_original_seeding(producer, database):
     assert prev_index > 0
 
     # Force the algo back to 1 to make sure the RNG state of original algo keeps incrementing.
-    # This is necessary because naive_algo is recopied from original algo and thus would always get
-    # the same RNG state if the original algo RNG state would not increment.
-    # See `Producer.produce` to observe the dummy `self.algorith.suggest()` used to increment
-    # original algo's RNG state.
+    # This is necessary because lies are rolled back on the original algo and thus it would always
+    # get the same RNG state if the RNG state was rolled back as well.
+    # See `Producer._discard_lies` to observe how the RNG state is preserved.
     producer.algorithm.seed_rng(0)
 
     producer.update()
@@ -5,7 +5,7 @@ import bson
 import numpy
 import pytest
 
-from orion.core.worker.trial import Trial
+from orion.core.worker.trial import Trial, TrialView
 
 
 class TestTrial(object):
@@ -242,3 +242,36 @@ class TestTrial(object):
         x = {'name': '/x', 'value': [1, 2], 'type': 'real'}
         trial = Trial(params=[x])
         assert trial.id == Trial(**bson.BSON.decode(bson.BSON.encode(trial.to_dict()))).id
+
+
+class TestTrialView(object):
+    """Test view of partially fetched trials"""
+
+    def test_lazy_decoding(self, exp_config):
+        """Check that params and results are only decoded when accessed."""
+        view = TrialView(exp_config[1][1])
+        assert view._params is None
+        assert view._results is None
+
+        assert view.params == Trial(**exp_config[1][1]).params
+        assert view._results is None
+        assert view.objective == Trial(**exp_config[1][1]).objective
+
+    def test_fields(self, exp_config):
+        """Check that only fetched fields are available."""
+        document = {'_id': 'abc', 'status': 'completed', 'results': exp_config[1][1]['results']}
+        view = TrialView(document)
+
+        assert view.id == 'abc'
+        assert view.status == 'completed'
+        assert view.objective.value == 10
+
+        with pytest.raises(AttributeError) as exc:
+            view.end_time
+        assert "'end_time' of the trial was not fetched" in str(exc.value)
+
+        with pytest.raises(AttributeError):
+            view.params
+
+        with pytest.raises(AttributeError):
+            view.unknown
@@ -986,10 +986,12 @@ def test_experiment_stats(hacked_exp, exp_config, random_dt):
     assert stats['trials_completed'] == 3
     assert stats['best_trials_id'] == exp_config[1][2]['_id']
     assert stats['best_evaluation'] == 2
+    assert stats['best_params'] == dict((param['name'], param['value'])
+                                        for param in exp_config[1][2]['params'])
     assert stats['start_time'] == exp_config[0][4]['metadata']['datetime']
     assert stats['finish_time'] == exp_config[1][1]['end_time']
     assert stats['duration'] == stats['finish_time'] - stats['start_time']
-    assert len(stats) == 6
+    assert len(stats) == 7
 
 
 class TestInitExperimentView(object):
@@ -1123,10 +1125,12 @@ def test_experiment_view_stats(hacked_exp, exp_config, random_dt):
     assert stats['trials_completed'] == 3
     assert stats['best_trials_id'] == exp_config[1][2]['_id']
     assert stats['best_evaluation'] == 2
+    assert stats['best_params'] == dict((param['name'], param['value'])
+                                        for param in exp_config[1][2]['params'])
     assert stats['start_time'] == exp_config[0][4]['metadata']['datetime']
     assert stats['finish_time'] == exp_config[1][1]['end_time']
     assert stats['duration'] == stats['finish_time'] - stats['start_time']
-    assert len(stats) == 6
+    assert len(stats) == 7
 
 
 @pytest.mark.usefixtures("with_user_tsirif")
@@ -2,13 +2,16 @@
 # -*- coding: utf-8 -*-
 """Collection of tests for :mod:`orion.core.worker.consumer`."""
 import datetime
+import threading
 import time
 
 import pytest
 
 from orion.core.io.experiment_builder import ExperimentBuilder
 from orion.core.utils.format_trials import tuple_to_trial
-from orion.core.worker.trial_pacemaker import TrialPacemaker
+from orion.core.worker import trial_pacemaker
+from orion.core.worker.trial import Trial
+from orion.core.worker.trial_pacemaker import HeartbeatService, TrialPacemaker
 from orion.storage.base import get_storage
 
 
@@ -103,3 +106,97 @@ def test_trial_heartbeat_not_updated_inbetween(exp, trial):
 
     assert heartbeat != trials[0].heartbeat
     trial_monitor.stop()
+
+
+class DumbStorage:
+    """Mock object for storage recording heartbeat updates"""
+
+    def __init__(self):
+        self.updates = []
+        self.stopped_ids = set()
+        self.updated = threading.Event()
+
+    def update_heartbeats(self, trials):
+        """See BaseStorageProtocol.update_heartbeats"""
+        self.updates.append(sorted(trial.id for trial in trials))
+        self.updated.set()
+        return [trial for trial in trials if trial.id in self.stopped_ids]
+
+
+class FakeClock:
+    """Clock moving forward only when told to"""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        """Return current time"""
+        return self.now
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """Return a storage recording heartbeat updates"""
+    storage = DumbStorage()
+    monkeypatch.setattr(trial_pacemaker, 'get_storage', lambda: storage)
+    return storage
+
+
+@pytest.fixture
+def trials():
+    """Return trials to monitor"""
+    return [Trial(experiment='exp', params=[{'name': '/x', 'type': 'real', 'value': float(i)}])
+            for i in range(3)]
+
+
+def test_heartbeats_are_batched(storage, trials):
+    """Test that heartbeats of all trials of the process are updated in a single query."""
+    clock = FakeClock()
+    service = HeartbeatService(clock=clock, threaded=False)
+    pacemakers = [TrialPacemaker(trial, wait_time=2, service=service) for trial in trials]
+    for pacemaker in pacemakers:
+        pacemaker.start()
+        clock.now += 0.5
+
+    assert not service.beat()
+    assert storage.updates == []
+
+    # Only the first pacemaker is due, all heartbeats are updated nonetheless
+    clock.now = 2
+    assert service.beat()
+    assert storage.updates == [sorted(trial.id for trial in trials)]
+    assert not service.beat()
+
+    storage.stopped_ids.add(trials[0].id)
+    clock.now = 4
+    assert service.beat()
+    assert pacemakers[0].stopped.is_set()
+    assert not pacemakers[1].stopped.is_set()
+
+    pacemakers[1].stop()
+    clock.now = 6
+    assert service.beat()
+    assert storage.updates[-1] == [trials[2].id]
+
+    pacemakers[2].stop()
+    clock.now = 8
+    assert not service.beat()
+    assert len(storage.updates) == 3
+
+
+def test_heartbeats_in_background(storage, trials):
+    """Test that heartbeats are updated by a background thread until trials are stopped."""
+    service = HeartbeatService()
+    pacemaker = TrialPacemaker(trials[0], wait_time=0.01, service=service)
+    pacemaker.start()
+    thread = service._thread
+
+    assert storage.updated.wait(timeout=10)
+    assert storage.updates[0] == [trials[0].id]
+
+    storage.stopped_ids.add(trials[0].id)
+    pacemaker.join(timeout=10)
+    assert pacemaker.stopped.is_set()
+
+    thread.join(timeout=10)
+    assert not thread.is_alive()
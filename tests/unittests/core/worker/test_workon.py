@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Collection of tests for the concurrent evaluation of trials in :mod:`orion.core.worker`."""
+import itertools
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+import orion.core.worker as worker
+from orion.core.worker import _ConcurrentWorkon, reserve_trial, ReservationMetrics
+import orion.core.worker.consumer as consumer
+from orion.core.worker.trial import Trial
+
+
+class StubExperiment:
+    """Experiment handing out new trials forever and recording their status"""
+
+    def __init__(self, working_dir):
+        self.name = 'stub'
+        self.working_dir = working_dir
+        self.is_broken = False
+        self.is_done = False
+        self.statuses = {}
+        self._count = itertools.count()
+
+    def reserve_trial(self, score_handle=None):
+        """Return a new reserved trial"""
+        trial = Trial(experiment='stub', status='reserved',
+                      params=[{'name': '/x', 'type': 'real', 'value': float(next(self._count))}])
+        self.statuses[trial.id] = trial.status
+        return trial
+
+    def set_trial_status(self, trial, status):
+        """Record the status of the trial"""
+        self.statuses[trial.id] = status
+
+    def update_completed_trial(self, trial, results_file):
+        """Record the trial as completed"""
+        self.statuses[trial.id] = 'completed'
+
+
+class FakeTime:
+    """Time moving forward only when sleeping"""
+
+    def __init__(self):
+        self.now = 0
+        self.sleeps = []
+
+    def time(self):
+        """Return current time"""
+        return self.now
+
+    def sleep(self, delay):
+        """Move time forward by `delay`"""
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+class ContendedExperiment(StubExperiment):
+    """Experiment whose trials are reserved by other workers a number of times"""
+
+    def __init__(self, working_dir, failures):
+        super(ContendedExperiment, self).__init__(working_dir)
+        self.failures = failures
+        self.attempts = 0
+
+    def reserve_trial(self, score_handle=None):
+        """Return None until failures are exhausted"""
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            return None
+
+        return super(ContendedExperiment, self).reserve_trial(score_handle)
+
+
+class CountingProducer:
+    """Producer counting the productions"""
+
+    def __init__(self):
+        self.algorithm = StubAlgorithm()
+        self.productions = 0
+
+    def update(self):
+        """Do nothing"""
+        pass
+
+    def produce(self):
+        """Count the production"""
+        self.productions += 1
+
+
+class StubAlgorithm:
+    """Algorithm without any score for the trials"""
+
+    score = None
+
+
+class StubProducer:
+    """Producer never called since the experiment always has trials available"""
+
+    algorithm = StubAlgorithm()
+
+    def update(self):
+        """Fail if called"""
+        raise AssertionError('Trials should not be produced')
+
+    produce = update
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    """Replace time in the worker by a clock moving forward only when sleeping"""
+    fake_time = FakeTime()
+    monkeypatch.setattr(worker, 'time', fake_time)
+    return fake_time
+
+
+class StubConsumer(consumer.Consumer):
+    """Consumer executing a command without any user's script or heartbeats"""
+
+    def __init__(self, experiment, command):  # pylint:disable=super-init-not-called
+        self.experiment = experiment
+        self.working_dir = experiment.working_dir
+        self.script_path = command[0]
+        self.cmd_args = command[1:]
+        self.pacemaker = None
+        self.interrupted = False
+        self._process = None
+        self._process_lock = threading.Lock()
+
+    def _consume(self, trial, workdirname):
+        self.execute_process(self.cmd_args, dict(os.environ))
+        return None
+
+
+class FailingConsumer(StubConsumer):
+    """Consumer failing once the other consumers have started their process"""
+
+    def __init__(self, experiment, started):
+        super(FailingConsumer, self).__init__(experiment, ['true'])
+        self.started = started
+
+    def _consume(self, trial, workdirname):
+        assert self.started.wait(timeout=10)
+        raise RuntimeError('Failure of the worker')
+
+
+@pytest.fixture
+def experiment(tmpdir):
+    """Return an experiment handing out trials forever"""
+    return StubExperiment(str(tmpdir))
+
+
+@pytest.fixture
+def started(monkeypatch):
+    """Return an event set once a process is started"""
+    started = threading.Event()
+    popen = consumer.subprocess.Popen
+
+    def start_process(*args, **kwargs):
+        process = popen(*args, **kwargs)
+        started.set()
+        return process
+
+    monkeypatch.setattr(consumer.subprocess, 'Popen', start_process)
+    return started
+
+
+@pytest.fixture
+def restore_sigterm():
+    """Restore the handler of SIGTERM installed by the workon"""
+    handler = signal.getsignal(signal.SIGTERM)
+    yield
+    signal.signal(signal.SIGTERM, handler)
+
+
+@pytest.mark.usefixtures('restore_sigterm')
+def test_error_in_thread_terminates_others(experiment, started):
+    """Test that an error in one thread interrupts the others and is raised by the worker."""
+    consumers = [StubConsumer(experiment, ['sleep', '60']), FailingConsumer(experiment, started)]
+    workon = _ConcurrentWorkon(experiment, StubProducer(), itertools.count(), consumers)
+
+    start = time.time()
+    with pytest.raises(RuntimeError) as exc:
+        workon.run()
+
+    assert str(exc.value) == 'Failure of the worker'
+    assert time.time() - start < 30
+    assert sorted(experiment.statuses.values()) == ['interrupted', 'reserved']
+
+
+@pytest.mark.usefixtures('restore_sigterm')
+def test_sigterm_interrupts_trials(experiment, started):
+    """Test that trials being evaluated are set as interrupted on SIGTERM."""
+    consumers = [StubConsumer(experiment, ['sleep', '60']) for _ in range(2)]
+    workon = _ConcurrentWorkon(experiment, StubProducer(), itertools.count(), consumers)
+
+    def terminate():
+        assert started.wait(timeout=10)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    thread = threading.Thread(target=terminate)
+    thread.start()
+
+    start = time.time()
+    with pytest.raises(KeyboardInterrupt):
+        workon.run()
+    thread.join()
+
+    assert time.time() - start < 30
+    assert experiment.statuses
+    assert set(experiment.statuses.values()) == set(['interrupted'])
+
+
+def test_interrupt_before_process_is_started(experiment, monkeypatch):
+    """Test that interrupting a consumer before its process is started prevents its execution."""
+    def fail(*args, **kwargs):
+        raise AssertionError('Process should not be started')
+
+    monkeypatch.setattr(consumer.subprocess, 'Popen', fail)
+
+    stub = StubConsumer(experiment, ['sleep', '60'])
+    trial = experiment.reserve_trial()
+    stub.interrupt()
+
+    with pytest.raises(KeyboardInterrupt):
+        stub.consume(trial)
+
+    assert experiment.statuses[trial.id] == 'interrupted'
+
+
+def test_reserve_trial_backs_off(tmpdir, fake_time):
+    """Test that reservation retries with exponentially growing delays"""
+    experiment = ContendedExperiment(str(tmpdir), failures=5)
+    producer = CountingProducer()
+    metrics = ReservationMetrics()
+
+    trial = reserve_trial(experiment, producer, max_wait=600, metrics=metrics)
+
+    assert trial is not None
+    assert producer.productions == 5
+    # No waiting before first production, other workers were faster afterwards
+    assert len(fake_time.sleeps) == 4
+    for retries, delay in enumerate(fake_time.sleeps):
+        assert 0 <= delay <= worker.BASE_BACKOFF * 2 ** retries
+
+    assert metrics.reservations == 1
+    assert metrics.attempts == 6
+    assert metrics.mean_latency == metrics.max_latency == sum(fake_time.sleeps)
+
+
+def test_reserve_trial_gives_up(tmpdir, fake_time):
+    """Test that reservation fails once the maximum wait is exceeded"""
+    experiment = ContendedExperiment(str(tmpdir), failures=float('inf'))
+    producer = CountingProducer()
+
+    with pytest.raises(RuntimeError) as exc:
+        reserve_trial(experiment, producer, max_wait=30)
+
+    assert 'Could not reserve a trial in less than 30 seconds' in str(exc.value)
+    assert 30 <= fake_time.now <= 30 + worker.MAX_BACKOFF
+
+
+def test_reserve_trial_when_done(tmpdir):
+    """Test that reservation stops without a trial once the experiment is done"""
+    experiment = ContendedExperiment(str(tmpdir), failures=1)
+    experiment.is_done = True
+    producer = CountingProducer()
+
+    assert reserve_trial(experiment, producer) is None
+    assert producer.productions == 0
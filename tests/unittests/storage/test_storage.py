@@ -195,6 +195,34 @@ class TestStorage:
             with pytest.raises(DuplicateKeyError):
                 storage.register_trial(Trial(**base_trial))
 
+    def test_register_trials(self, storage):
+        """Test register a batch of trials"""
+        with OrionState(experiments=[base_experiment], database=storage) as cfg:
+            storage = cfg.storage()
+            trials = [Trial(**_generate(base_trial, 'status', value=status))
+                      for status in ['new', 'completed']]
+            for i, trial in enumerate(trials):
+                trial.params[0].value = str(i)
+
+            assert storage.register_trials(trials) == []
+
+            for trial in trials:
+                assert storage.get_trial(trial).to_dict() == trial.to_dict()
+
+    def test_register_trials_with_duplicates(self, storage):
+        """Test register a batch of trials with duplicates reported instead of raised"""
+        with OrionState(
+                experiments=[base_experiment], trials=[base_trial], database=storage) as cfg:
+            storage = cfg.storage()
+            new_trial = Trial(**base_trial)
+            new_trial.params[0].value = 'gru'
+            trials = [Trial(**base_trial), new_trial, Trial(**base_trial)]
+
+            duplicates = storage.register_trials(trials)
+
+            assert duplicates == [trials[0], trials[2]]
+            assert storage.get_trial(new_trial) is not None
+
     def test_register_lie(self, storage):
         """Test register lie"""
         with OrionState(experiments=[base_experiment], database=storage) as cfg:
@@ -252,6 +280,27 @@ class TestStorage:
             assert len(trials1) == len(cfg.trials), 'trial count should match'
             assert len(trials2) == len(cfg.trials), 'trial count should match'
 
+    def test_fetch_trials_with_selection(self, storage):
+        """Test fetch only some fields of experiment trials"""
+        with OrionState(
+                experiments=[base_experiment], trials=generate_trials(), database=storage) as cfg:
+            storage = cfg.storage()
+            experiment = cfg.get_experiment('default_name', 'default_user', version=None)
+
+            trials = storage.fetch_trials(experiment=experiment)
+            views = storage.fetch_trials(experiment=experiment,
+                                         selection={'status': 1, 'results': 1})
+
+            assert len(views) == len(trials)
+            for trial, view in zip(trials, views):
+                assert view.id == trial.id
+                assert view.status == trial.status
+                assert view.objective == trial.objective
+                with pytest.raises(AttributeError):
+                    view.params
+
+                assert view.to_trial().status == trial.status
+
     def test_get_trial(self, storage):
         """Test get trial"""
         with OrionState(
@@ -425,6 +474,87 @@ class TestStorage:
             for trial in trials:
                 assert trial.status != 'completed'
 
+    def test_fetch_completed_trials(self, storage):
+        """Test fetch trials completed since a given time"""
+        trials = generate_trials(status=['completed', 'completed', 'completed', 'new'])
+        for i, trial in enumerate(trials):
+            trial['end_time'] = datetime.datetime(2017, 11, 23, i)
+
+        with OrionState(experiments=[base_experiment], trials=trials, database=storage) as cfg:
+            storage = cfg.storage()
+            experiment = cfg.get_experiment('default_name', 'default_user', version=None)
+
+            trials = storage.fetch_completed_trials(experiment)
+            assert len(trials) == 3
+            for trial in trials:
+                assert trial.status == 'completed'
+
+            trials = storage.fetch_completed_trials(
+                experiment, since=datetime.datetime(2017, 11, 23, 1))
+            assert sorted(trial.end_time.hour for trial in trials) == [1, 2]
+
+    def test_fetch_trials_stats(self, storage):
+        """Test aggregating results of completed trials"""
+        trials = generate_trials(status=['completed', 'completed', 'completed', 'new'])
+        for i, trial in enumerate(trials):
+            trial['end_time'] = datetime.datetime(2017, 11, 23, i)
+            trial['results'][0]['value'] = [3, 1, 2, 0][i]
+
+        with OrionState(experiments=[base_experiment], trials=trials, database=storage) as cfg:
+            storage = cfg.storage()
+            experiment = cfg.get_experiment('default_name', 'default_user', version=None)
+
+            best_trial = [trial for trial in cfg.trials if trial['results'][0]['value'] == 1][0]
+            stats = storage.fetch_trials_stats(experiment)
+            assert stats == dict(
+                trials_completed=3,
+                finish_time=datetime.datetime(2017, 11, 23, 2),
+                best_id=best_trial['_id'],
+                best_objective=1,
+                best_params=best_trial['params'])
+
+    def test_fetch_trials_stats_counts_trials(self, storage):
+        """Test counting trials without objective or with many objectives once"""
+        trials = generate_trials(status=['completed', 'completed', 'completed'])
+        for i, trial in enumerate(trials):
+            trial['end_time'] = datetime.datetime(2017, 11, 23, i)
+            trial['results'][0]['value'] = [3, 1, 2][i]
+        trials[0]['results'] = []
+        trials[1]['results'].append({'name': 'other', 'type': 'objective', 'value': 4})
+
+        with OrionState(experiments=[base_experiment], trials=trials, database=storage) as cfg:
+            storage = cfg.storage()
+            experiment = cfg.get_experiment('default_name', 'default_user', version=None)
+
+            stats = storage.fetch_trials_stats(experiment)
+            assert stats['trials_completed'] == 3
+            assert stats['finish_time'] == datetime.datetime(2017, 11, 23, 2)
+            assert stats['best_objective'] == 1
+
+    def test_fetch_trials_stats_without_objective(self, storage):
+        """Test aggregating completed trials which have no objective"""
+        trials = generate_trials(status=['completed'])
+        trials[0]['results'] = []
+
+        with OrionState(experiments=[base_experiment], trials=trials, database=storage) as cfg:
+            storage = cfg.storage()
+            experiment = cfg.get_experiment('default_name', 'default_user', version=None)
+
+            stats = storage.fetch_trials_stats(experiment)
+            assert stats['trials_completed'] == 1
+            assert stats['best_id'] is None
+            assert stats['best_objective'] is None
+            assert stats['best_params'] is None
+
+    def test_fetch_trials_stats_empty(self, storage):
+        """Test aggregating results without completed trials"""
+        with OrionState(experiments=[base_experiment], trials=generate_trials(status=['new']),
+                        database=storage) as cfg:
+            storage = cfg.storage()
+            experiment = cfg.get_experiment('default_name', 'default_user', version=None)
+
+            assert storage.fetch_trials_stats(experiment) is None
+
     def test_fetch_trial_by_status(self, storage):
         """Test fetch completed trials"""
         with OrionState(
@@ -442,6 +572,15 @@ class TestStorage:
             for trial in trials:
                 assert trial.status == 'completed', trial
 
+            trials = storage.fetch_trial_by_status(experiment, 'completed',
+                                                   selection={'end_time': 1})
+
+            assert len(trials) == count
+            for trial in trials:
+                assert trial.end_time is None
+                with pytest.raises(AttributeError):
+                    trial.status
+
     def test_count_completed_trials(self, storage):
         """Test count completed trials"""
         with OrionState(
@@ -498,3 +637,26 @@ class TestStorage:
 
                 assert trial3.heartbeat is None, \
                     'Legacy does not update trials with a status different from reserved'
+
+    def test_update_heartbeats(self, storage):
+        """Test update heartbeats of many trials at once"""
+        with OrionState(experiments=[base_experiment],
+                        trials=generate_trials(status=['reserved', 'reserved', 'completed']),
+                        database=storage) as cfg:
+            storage = cfg.storage()
+
+            exp = cfg.get_experiment(name='default_name')
+            trials = storage.fetch_trials(exp)
+
+            stopped = storage.update_heartbeats(trials)
+
+            assert [trial.id for trial in stopped] == \
+                [trial.id for trial in trials if trial.status == 'completed']
+            for trial in trials:
+                heartbeat = storage.get_trial(trial).heartbeat
+                if trial.status == 'reserved':
+                    assert heartbeat is not None
+                else:
+                    assert heartbeat is None
+
+            assert storage.update_heartbeats([]) == []